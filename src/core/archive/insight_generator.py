@@ -17,6 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 # from dyk.src.prompts.prompt_templates_old import PromptTemplates, RegionSpecificPrompts
 from src.prompts.prompt_templates import PromptTemplates
 from src.utils.config_loader import ConfigLoader
+from src.utils.json_parsing import parse_json_response
 from services.pubmed_service import EvidenceRetriever, PubMedAPI
 
 
@@ -140,23 +141,7 @@ class InsightGenerator:
 
     def _parse_json_response(self, response: str) -> Dict[str, Any]:
         """Parse JSON from LLM response, handling markdown code blocks."""
-        # Remove markdown code blocks if present
-        response = response.strip()
-        if response.startswith("```json"):
-            response = response[7:]
-        if response.startswith("```"):
-            response = response[3:]
-        if response.endswith("```"):
-            response = response[:-3]
-
-        response = response.strip()
-
-        try:
-            return json.loads(response)
-        except json.JSONDecodeError as e:
-            print(f"JSON parse error: {e}")
-            print(f"Response: {response[:500]}")
-            raise
+        return parse_json_response(response, "Insight Generator")
 
 
 # Example usage
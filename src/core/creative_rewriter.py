@@ -9,6 +9,10 @@ import json
 from typing import Any, Dict
 from src.prompts.prompt_templates import PromptTemplates
 from src.core.llm_client import OpenRouterClient
+from src.utils.json_parsing import dump_json, parse_json_response
+
+# Responses longer than this are parsed in a worker thread
+_THREAD_PARSE_MIN_CHARS = 4096
 
 
 class CreativeRewriter:
@@ -68,152 +72,37 @@ class CreativeRewriter:
             - "variations": list of rewritten variations
         """
 
+        # Generate prompt (CPU only, no concurrency slot needed)
+        prompt = self.prompt_template.creative_rewriting_prompt(
+            insight=insight,
+            cohort=cohort,
+            market=market,
+            num_variations=num_variations,
+        )
+
+        # Hold a concurrency slot only for the network call
         async with self.semaphore:
-            # Generate prompt
-            prompt = self.prompt_template.creative_rewriting_prompt(
-                insight=insight,
-                cohort=cohort,
-                market=market,
-                num_variations=num_variations,
-            )
-
-            # Call LLM asynchronously
             results = await self.llm.generate(prompt, model, temperature, max_tokens)
+
+        # Parse response (large ones off the event loop)
+        if len(results) > _THREAD_PARSE_MIN_CHARS:
+            results = await asyncio.to_thread(self._parse_json_response, results)
+        else:
             results = self._parse_json_response(results)
 
-            insight_copy = insight.copy()
-            insight_copy["variations"] = results["variations"]
-            return insight_copy
+        insight_copy = insight.copy()
+        insight_copy["variations"] = results["variations"]
+        return insight_copy
 
     def _parse_json_response(self, response: str) -> Dict[str, Any]:
         """Parse JSON from LLM response with automatic repair for common issues."""
-        response = response.strip()
-
-        # Remove markdown code blocks (common LLM behavior)
-        if response.startswith("```json"):
-            response = response[7:]
-        if response.startswith("```"):
-            response = response[3:]
-        if response.endswith("```"):
-            response = response[:-3]
-
-        response = response.strip()
-
-        # Try parsing original response
-        try:
-            return json.loads(response)
-        except json.JSONDecodeError as e:
-            # Attempt automatic repairs for common LLM JSON errors
-            repaired = self._attempt_json_repair(response, e)
-
-            if repaired:
-                print(
-                    f"⚠️  Auto-repaired JSON (Creative Rewriter): {e.msg} at position {e.pos}"
-                )
-                try:
-                    return json.loads(repaired)
-                except json.JSONDecodeError:
-                    pass  # Repair failed, fall through to error logging
-
-            # Repair failed or not attempted - log detailed error
-            print("\n" + "=" * 80)
-            print("❌ JSON PARSE ERROR (Creative Rewriter)")
-            print("=" * 80)
-            print(f"Error: {e}")
-            print(f"Position: Line {e.lineno}, Column {e.colno}")
-
-            print("\n--- CONTEXT AROUND ERROR ---")
-            start = max(0, e.pos - 150)
-            end = min(len(response), e.pos + 150)
-            snippet = response[start:end]
-            pointer_pos = e.pos - start
-            print(snippet)
-            print(" " * pointer_pos + "^" * 10 + " ERROR HERE")
-
-            print("\n--- FULL RESPONSE ---")
-            print(response)
-            print("=" * 80 + "\n")
-
-            raise
-
-    def _attempt_json_repair(self, response: str, error: json.JSONDecodeError) -> str:
-        """
-        Attempt to repair common JSON formatting issues from LLM responses.
-
-        Common issues fixed:
-        1. Missing commas between object properties
-        2. Trailing commas before closing braces/brackets
-        3. Missing closing brackets/braces
-
-        Args:
-            response: The malformed JSON string
-            error: The JSONDecodeError with position information
-
-        Returns:
-            Repaired JSON string if repair was attempted, None otherwise
-        """
-
-        # Only attempt repair for specific, fixable errors
-        error_msg = error.msg.lower()
-
-        # Fix 1: Missing comma between properties
-        # Error: "Expecting ',' delimiter" or "Expecting property name"
-        if (
-            "expecting ',' delimiter" in error_msg
-            or "expecting property name" in error_msg
-        ):
-            # Check if there's a missing comma before a quote
-            pos = error.pos
-            if pos < len(response) and response[pos] == '"':
-                # Look backward to find the end of previous value
-                # Common pattern: }"key" should be },"key"
-                if pos > 0 and response[pos - 1] == "}":
-                    return response[:pos] + "," + response[pos:]
-                # Pattern: ]"key" should be ],"key"
-                if pos > 0 and response[pos - 1] == "]":
-                    return response[:pos] + "," + response[pos:]
-
-        # Fix 2: Trailing comma before closing brace/bracket
-        # Error: "Expecting property name" right after comma
-        if "expecting property name" in error_msg:
-            pos = error.pos
-            # Look backward for comma followed by whitespace and closing brace
-            check_start = max(0, pos - 10)
-            snippet = response[check_start : pos + 5]
-            if "," in snippet and ("}" in snippet or "]" in snippet):
-                # Find the trailing comma
-                for i in range(pos - 1, max(0, pos - 20), -1):
-                    if response[i] == ",":
-                        # Check if only whitespace between comma and closing brace
-                        after_comma = response[i + 1 : pos + 5].strip()
-                        if after_comma and after_comma[0] in ["}", "]"]:
-                            return response[:i] + response[i + 1 :]
-
-        # Fix 3: Missing closing braces/brackets (simple heuristic)
-        if "expecting" in error_msg and error.pos >= len(response) - 5:
-            # Count opening and closing braces
-            open_braces = response.count("{")
-            close_braces = response.count("}")
-            open_brackets = response.count("[")
-            close_brackets = response.count("]")
-
-            # Add missing closing characters
-            missing = ""
-            if close_brackets < open_brackets:
-                missing += "]" * (open_brackets - close_brackets)
-            if close_braces < open_braces:
-                missing += "}" * (open_braces - close_braces)
-
-            if missing:
-                return response + missing
-
-        # No repair attempted
-        return None
+        return parse_json_response(response, "Creative Rewriter")
 
 
 # Example usage
 if __name__ == "__main__":
     from dotenv import load_dotenv
+    from src.utils.event_loop import run
     import time
     from pathlib import Path
     import datetime
@@ -251,7 +140,7 @@ if __name__ == "__main__":
             # Rewrite batch in parallel
             print(f"Batch rewrite ({len(insights)} insights)...")
 
-            start = time.time()
+            start = time.monotonic()
             # Manual loop pattern - consistent with pipeline architecture
             tasks = [
                 rewriter.rewrite(
@@ -264,7 +153,7 @@ if __name__ == "__main__":
                 for insight in insights
             ]
             results = await asyncio.gather(*tasks, return_exceptions=True)
-            duration = time.time() - start
+            duration = time.monotonic() - start
 
             successes = 0
             failures = 0
@@ -332,10 +221,9 @@ if __name__ == "__main__":
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             output_file = output_dir / f"creative_{timestamp}.json"
 
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
+            dump_json(output_file, output_data)
 
             print(f"\n✓ Saved to: {output_file}")
 
     # Run test
-    asyncio.run(main())
+    run(main())
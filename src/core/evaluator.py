@@ -4,10 +4,21 @@ Ensures insights are factually accurate, safe, faithful to evidence, relevant, a
 """
 
 import asyncio
+import itertools
 import json
-from typing import Any, Dict
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 from src.prompts.prompt_templates import PromptTemplates
-from src.core.llm_client import OpenRouterClient
+from src.core.llm_client import FatalAPIError, OpenRouterClient, RateLimiter
+from src.utils.response_cache import ResponseCache
+from src.utils.json_parsing import dump_json, parse_json_response
+
+# Number of rendered validation prompts kept for re-evaluation across models
+_PROMPT_CACHE_SIZE = 2048
+
+# Responses longer than this are parsed in a worker thread
+_THREAD_PARSE_MIN_CHARS = 4096
 
 
 class InsightEvaluator:
@@ -28,6 +39,9 @@ class InsightEvaluator:
         llm_client: OpenRouterClient,
         prompt_template: PromptTemplates,
         max_concurrent: int = 20,
+        cache_dir: Optional[Path] = None,
+        force_cache: bool = False,
+        requests_per_minute: Optional[int] = None,
     ):
         """
         Initialize evaluator.
@@ -36,10 +50,23 @@ class InsightEvaluator:
             llm_client: OpenRouterClient instance
             prompt_templates: PromptTemplates instance
             max_concurrent: Maximum number of concurrent evaluations (default: 20)
+            cache_dir: Directory for the on-disk response cache (None = no caching)
+            force_cache: Also cache non-deterministic calls (temperature > 0)
+            requests_per_minute: Optional request rate cap for this component,
+                applied on top of the client's shared rate limiter
         """
         self.llm = llm_client
         self.prompt_template = prompt_template
+        self.max_concurrent = max_concurrent
         self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.force_cache = force_cache
+        self._prompt_cache = OrderedDict()
+        self.rate_limiter = (
+            RateLimiter(requests_per_minute=requests_per_minute)
+            if requests_per_minute
+            else None
+        )
 
     async def evaluate(
         self,
@@ -67,142 +94,154 @@ class InsightEvaluator:
             A dictionary with evaluation results
         """
 
-        async with self.semaphore:
-            # Generate prompt
-            prompt = self.prompt_template.validation_prompt(
-                insight, cohort, insight_template, market
+        # Generate prompt (CPU only, no concurrency slot needed)
+        prompt = self._validation_prompt(insight, cohort, insight_template, market)
+
+        # Only deterministic calls are cached unless explicitly forced
+        use_cache = self.cache is not None and (temperature <= 0 or self.force_cache)
+        if use_cache:
+            cache_key = ResponseCache.make_key(
+                prompt, model or self.llm.default_model, temperature, max_tokens
             )
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                return cached
+
+        # Hold a concurrency slot only for the network call
+        async with self.semaphore:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
 
-            # Call LLM asynchronously
             evaluation_results = await self.llm.generate(
                 prompt, model, temperature, max_tokens
             )
+
+        # Parse response (large ones off the event loop)
+        if len(evaluation_results) > _THREAD_PARSE_MIN_CHARS:
+            evaluation_results = await asyncio.to_thread(
+                self._parse_json_response, evaluation_results
+            )
+        else:
             evaluation_results = self._parse_json_response(evaluation_results)
 
-            return evaluation_results
+        if use_cache:
+            await asyncio.to_thread(self.cache.put, cache_key, evaluation_results)
 
-    def _parse_json_response(self, response: str) -> Dict[str, Any]:
-        """Parse JSON from LLM response with automatic repair for common issues."""
-        response = response.strip()
-
-        # Remove markdown code blocks (common LLM behavior)
-        if response.startswith("```json"):
-            response = response[7:]
-        if response.startswith("```"):
-            response = response[3:]
-        if response.endswith("```"):
-            response = response[:-3]
-
-        response = response.strip()
-
-        # Try parsing original response
-        try:
-            return json.loads(response)
-        except json.JSONDecodeError as e:
-            # Attempt automatic repairs for common LLM JSON errors
-            repaired = self._attempt_json_repair(response, e)
-
-            if repaired:
-                print(f"⚠️  Auto-repaired JSON (Evaluator): {e.msg} at position {e.pos}")
-                try:
-                    return json.loads(repaired)
-                except json.JSONDecodeError:
-                    pass  # Repair failed, fall through to error logging
-
-            # Repair failed or not attempted - log detailed error
-            print("\n" + "=" * 80)
-            print("❌ JSON PARSE ERROR (Evaluator)")
-            print("=" * 80)
-            print(f"Error: {e}")
-            print(f"Position: Line {e.lineno}, Column {e.colno}")
-
-            print("\n--- CONTEXT AROUND ERROR ---")
-            start = max(0, e.pos - 150)
-            end = min(len(response), e.pos + 150)
-            snippet = response[start:end]
-            pointer_pos = e.pos - start
-            print(snippet)
-            print(" " * pointer_pos + "^" * 10 + " ERROR HERE")
-
-            print("\n--- FULL RESPONSE ---")
-            print(response)
-            print("=" * 80 + "\n")
-
-            raise
-
-    def _attempt_json_repair(self, response: str, error: json.JSONDecodeError) -> str:
+        return evaluation_results
+
+    async def evaluate_batch(
+        self,
+        insights: List[Dict[str, Any]],
+        market: str,
+        model: str = None,
+        temperature: float = 0.3,
+        max_tokens: int = 4000,
+        window: Optional[int] = None,
+    ) -> List[Any]:
         """
-        Attempt to repair common JSON formatting issues from LLM responses.
+        Evaluate many insights with a bounded number of in-flight tasks (async).
 
-        Common issues fixed:
-        1. Missing commas between object properties
-        2. Trailing commas before closing braces/brackets
-        3. Missing closing brackets/braces
+        Only `window` evaluate() tasks exist at a time; a new one is started
+        as each finishes, so memory stays flat for large batches. Use this
+        instead of gathering evaluate() calls directly.
 
         Args:
-            response: The malformed JSON string
-            error: The JSONDecodeError with position information
+            insights: Insights to evaluate, each with "cohort" and
+                "insight_template" entries
+            market: The target region for cultural appropriateness
+            model: Model to use (optional, uses client default)
+            temperature: Sampling temperature (default: 0.3 for consistency)
+            max_tokens: Maximum tokens (default: 4000)
+            window: Maximum in-flight tasks (default: max_concurrent)
 
         Returns:
-            Repaired JSON string if repair was attempted, None otherwise
+            Results in input order; a failed evaluation yields its exception
+
+        Raises:
+            FatalAPIError: If any call hits an unrecoverable API error; the
+                remaining in-flight evaluations are cancelled
+        """
+        window = window or self.max_concurrent
+        results: List[Any] = [None] * len(insights)
+        pending = enumerate(insights)
+        task_to_index = {}
+
+        while True:
+            for index, insight in itertools.islice(
+                pending, window - len(task_to_index)
+            ):
+                task = asyncio.create_task(
+                    self.evaluate(
+                        insight,
+                        insight["cohort"],
+                        insight["insight_template"],
+                        market,
+                        model,
+                        temperature,
+                        max_tokens,
+                    )
+                )
+                task_to_index[task] = index
+
+            if not task_to_index:
+                break
+
+            done, _ = await asyncio.wait(
+                task_to_index, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                result = task.exception() or task.result()
+                if isinstance(result, FatalAPIError):
+                    # Every remaining call would fail too: stop spending on them
+                    for pending_task in task_to_index:
+                        pending_task.cancel()
+                    raise result
+                results[task_to_index.pop(task)] = result
+
+        return results
+
+    def _validation_prompt(
+        self,
+        insight: Dict[str, Any],
+        cohort: Dict[str, Any],
+        insight_template: Dict[str, Any],
+        market: str,
+    ) -> str:
         """
+        Render the validation prompt, reusing it when the same insight is
+        evaluated again (e.g. by several judge models).
 
-        # Only attempt repair for specific, fixable errors
-        error_msg = error.msg.lower()
-
-        # Fix 1: Missing comma between properties
-        # Error: "Expecting ',' delimiter" or "Expecting property name"
-        if (
-            "expecting ',' delimiter" in error_msg
-            or "expecting property name" in error_msg
-        ):
-            # Check if there's a missing comma before a quote
-            pos = error.pos
-            if pos < len(response) and response[pos] == '"':
-                # Look backward to find the end of previous value
-                # Common pattern: }"key" should be },"key"
-                if pos > 0 and response[pos - 1] == "}":
-                    return response[:pos] + "," + response[pos:]
-                # Pattern: ]"key" should be ],"key"
-                if pos > 0 and response[pos - 1] == "]":
-                    return response[:pos] + "," + response[pos:]
-
-        # Fix 2: Trailing comma before closing brace/bracket
-        # Error: "Expecting property name" right after comma
-        if "expecting property name" in error_msg:
-            pos = error.pos
-            # Look backward for comma followed by whitespace and closing brace
-            check_start = max(0, pos - 10)
-            snippet = response[check_start : pos + 5]
-            if "," in snippet and ("}" in snippet or "]" in snippet):
-                # Find the trailing comma
-                for i in range(pos - 1, max(0, pos - 20), -1):
-                    if response[i] == ",":
-                        # Check if only whitespace between comma and closing brace
-                        after_comma = response[i + 1 : pos + 5].strip()
-                        if after_comma and after_comma[0] in ["}", "]"]:
-                            return response[:i] + response[i + 1 :]
-
-        # Fix 3: Missing closing braces/brackets (simple heuristic)
-        if "expecting" in error_msg and error.pos >= len(response) - 5:
-            # Count opening and closing braces
-            open_braces = response.count("{")
-            close_braces = response.count("}")
-            open_brackets = response.count("[")
-            close_brackets = response.count("]")
-
-            # Add missing closing characters
-            missing = ""
-            if close_brackets < open_brackets:
-                missing += "]" * (open_brackets - close_brackets)
-            if close_braces < open_braces:
-                missing += "}" * (open_braces - close_braces)
-
-            if missing:
-                return response + missing
-
-        # No repair attempted
-        return None
+        The key holds only the fields the prompt reads; cohorts and templates
+        are identified by name and type.
+        """
+        key = (
+            insight.get("hook"),
+            insight.get("explanation"),
+            insight.get("action"),
+            insight.get("source_name"),
+            insight.get("source_url"),
+            cohort["name"],
+            insight_template["type"],
+            market,
+        )
+
+        prompt = self._prompt_cache.get(key)
+        if prompt is not None:
+            self._prompt_cache.move_to_end(key)
+            return prompt
+
+        prompt = self.prompt_template.validation_prompt(
+            insight, cohort, insight_template, market
+        )
+        self._prompt_cache[key] = prompt
+        if len(self._prompt_cache) > _PROMPT_CACHE_SIZE:
+            self._prompt_cache.popitem(last=False)
+
+        return prompt
+
+    def _parse_json_response(self, response: str) -> Dict[str, Any]:
+        """Parse JSON from LLM response with automatic repair for common issues."""
+        return parse_json_response(response, "Evaluator")
 
 
 # Example usage
@@ -211,6 +250,7 @@ if __name__ == "__main__":
     import time
     from pathlib import Path
     from dotenv import load_dotenv
+    from src.utils.event_loop import run
 
     # Load environment variables
     load_dotenv(Path(__file__).parent.parent.parent / ".env")
@@ -243,22 +283,11 @@ if __name__ == "__main__":
 
             # Evaluate batch in parallel
             print(f"Batch evaluation ({len(insights)} insights)...")
-            start = time.time()
-            tasks = [
-                evaluator.evaluate(
-                    insight,
-                    insight["cohort"],
-                    insight["insight_template"],
-                    market,
-                    model,
-                    temperature=0.3,
-                    max_tokens=4000,
-                )
-                for insight in insights
-            ]
-
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            duration = time.time() - start
+            start = time.monotonic()
+            results = await evaluator.evaluate_batch(
+                insights, market, model, temperature=0.3, max_tokens=4000
+            )
+            duration = time.monotonic() - start
 
             successes = 0
             failures = 0
@@ -287,7 +316,7 @@ if __name__ == "__main__":
                 evaluated_insights.append(insight)
 
             print(f"✓ Completed {len(results)} evaluations in {duration:.2f}s")
-            print(f"✓ Success rate: {successes}/{len(tasks)}")
+            print(f"✓ Success rate: {successes}/{len(results)}")
             print(f"Average: {duration / len(results):.2f}s per insight\n")
 
             output_data = {
@@ -299,7 +328,7 @@ if __name__ == "__main__":
                     "temperature": 0.3,
                     "max_tokens": 4000,
                     "generated_at": datetime.datetime.now().isoformat(),
-                    "total_calls": len(tasks),
+                    "total_calls": len(results),
                     "successful_calls": successes,
                     "failed_calls": failures,
                     "duration_seconds": round(duration, 2),
@@ -314,8 +343,7 @@ if __name__ == "__main__":
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             json_file = output_dir / f"evaluated_{timestamp}.json"
 
-            with open(json_file, "w", encoding="utf-8") as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
+            dump_json(json_file, output_data)
 
             print(f"\n✓ Saved JSON to: {json_file}")
 
@@ -404,4 +432,4 @@ if __name__ == "__main__":
             print(f"✓ Saved CSV to: {csv_file}")
 
     # Run test
-    asyncio.run(main())
+    run(main())
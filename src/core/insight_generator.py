@@ -4,9 +4,144 @@ Insight Generator with async processing support.
 
 import asyncio
 import json
-from typing import Dict, Any
-from src.core.llm_client import OpenRouterClient
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from src.core.llm_client import AdmissionController, OpenRouterClient, RateLimiter
 from src.prompts.prompt_templates import PromptTemplates
+from src.utils.response_cache import ResponseCache
+from src.utils.json_parsing import dumps_line, parse_json_response
+
+logger = logging.getLogger(__name__)
+
+# Responses longer than this are parsed in a worker thread
+_THREAD_PARSE_MIN_CHARS = 4096
+
+# Structured output requested from the provider (JSON schema of the
+# generation prompt's OUTPUT FORMAT)
+_NULLABLE_STRING = {"type": ["string", "null"]}
+_INSIGHTS_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "hook": {"type": "string"},
+            "explanation": {"type": "string"},
+            "action": {"type": "string"},
+            "source_name": {"type": "string"},
+            "source_url": _NULLABLE_STRING,
+            "numeric_claim": _NULLABLE_STRING,
+        },
+        "required": [
+            "hook",
+            "explanation",
+            "action",
+            "source_name",
+            "source_url",
+            "numeric_claim",
+        ],
+        "additionalProperties": False,
+    },
+}
+_INSIGHTS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "insights",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {"insights": _INSIGHTS_SCHEMA},
+            "required": ["insights"],
+            "additionalProperties": False,
+        },
+    },
+}
+# Multi-template calls group insights per template under "results"
+_MULTI_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "insights_by_template",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "results": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "template_id": {"type": "string"},
+                            "insights": _INSIGHTS_SCHEMA,
+                        },
+                        "required": ["template_id", "insights"],
+                        "additionalProperties": False,
+                    },
+                }
+            },
+            "required": ["results"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# Output token budget of a single-template generate() call; multi-template
+# calls get this much per template
+_MAX_TOKENS_PER_TEMPLATE = 4000
+
+# Buffer for the NDJSON output file: few large writes instead of one per line
+_OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Decoder for single array items
+_ITEM_DECODER = json.JSONDecoder()
+
+
+def _decode_complete_items(buffer: str, pos: int) -> Tuple[List[Any], int]:
+    """
+    Decode the array items that are complete in buffer, starting at pos.
+
+    Returns the decoded items and the position of the first undecoded one
+    (an incomplete item is left for the next call).
+    """
+    items = []
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(buffer) or buffer[pos] == "]":
+            return items, pos
+        try:
+            item, pos = _ITEM_DECODER.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            return items, pos
+        items.append(item)
+
+
+# Boundary between two objects in an array, used to skip past a malformed item
+_NEXT_ITEM_RE = re.compile(r"\}\s*,\s*(?=\{)")
+
+
+def _salvage_items(response: str, result_key: str) -> List[Any]:
+    """
+    Recover the well-formed items of the result_key array from a response
+    that failed to parse as a whole (truncated output or a malformed entry).
+
+    A malformed item is skipped by resuming at the next "}, {" boundary.
+    """
+    match = re.search(r'"%s"\s*:\s*\[' % re.escape(result_key), response)
+    if not match:
+        return []
+
+    items = []
+    pos = match.end()
+    while True:
+        found, pos = _decode_complete_items(response, pos)
+        items.extend(found)
+        if pos >= len(response) or response[pos] == "]":
+            return items
+        boundary = _NEXT_ITEM_RE.search(response, pos)
+        if not boundary:
+            return items
+        pos = boundary.end()
 
 
 class InsightGenerator:
@@ -17,6 +152,10 @@ class InsightGenerator:
         llm_client: OpenRouterClient,
         prompt_template: PromptTemplates,
         max_concurrent: int = 10,
+        cache_dir: Optional[Path] = None,
+        force_cache: bool = False,
+        requests_per_minute: Optional[int] = None,
+        structured_output: bool = True,
     ):
         """
         Initialize insight generator.
@@ -25,10 +164,78 @@ class InsightGenerator:
             llm_client: OpenRouterClient instance
             prompt_template: PromptTemplates instance
             max_concurrent: Maximum number of concurrent generation calls (default: 10)
+            cache_dir: Directory for the on-disk response cache (None = no caching)
+            force_cache: Also cache non-deterministic calls (temperature > 0)
+            requests_per_minute: Optional request rate cap for this component,
+                applied on top of the client's shared rate limiter
+            structured_output: Request JSON-schema output from the provider;
+                the JSON repair parser remains as a fallback
         """
         self.llm = llm_client
         self.prompt_template = prompt_template
-        self.semaphore = asyncio.Semaphore(max_concurrent)
+        # Resizable concurrency window; the client narrows it on 429s and
+        # widens it again on sustained successes
+        self.admission = AdmissionController(max_concurrent)
+        self.llm.attach_admission(self.admission)
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.force_cache = force_cache
+        self.response_format = (
+            _INSIGHTS_RESPONSE_FORMAT if structured_output else None
+        )
+        # Responses that did not follow the requested schema
+        self.schema_rejected_count = 0
+        self.partial_recoveries = 0
+        # Hash of the static prompt block last sent to warm the provider cache
+        self._warmed_block_hash = None
+        self.rate_limiter = (
+            RateLimiter(requests_per_minute=requests_per_minute)
+            if requests_per_minute
+            else None
+        )
+
+    async def __aenter__(self):
+        # Open the client's pooled session once for the generator's lifetime
+        await self.llm.__aenter__()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.llm.__aexit__(*args)
+
+    async def warm_prompt_cache(
+        self,
+        health_domains: dict,
+        sources: dict,
+        market: str = "singapore",
+        model: str = None,
+    ) -> bool:
+        """
+        Populate the provider's prompt cache with the static generation block.
+
+        Sends one max_tokens=1 request carrying the same cache-marked system
+        block as generate(), so the grid's calls read it from cache instead of
+        each paying for it. Skipped while the block is unchanged since the last
+        warm-up.
+
+        Returns:
+            True if a warm-up request was sent successfully
+        """
+        _, block_hash = self.prompt_template.build_cag_block(
+            sources, health_domains, market
+        )
+        if block_hash == self._warmed_block_hash:
+            return False
+
+        messages = self.prompt_template.cache_warmup_messages(
+            sources, health_domains, market
+        )
+        try:
+            await self.llm.generate(messages, model, 0.0, 1)
+        except Exception as e:
+            logger.warning("Prompt cache warm-up failed: %s", e)
+            return False
+
+        self._warmed_block_hash = block_hash
+        return True
 
     async def generate(
         self,
@@ -40,168 +247,187 @@ class InsightGenerator:
         num_insights: int = 5,
         model: str = None,
         temperature: float = 0.7,
-        max_tokens: int = 4000,
+        max_tokens: int = _MAX_TOKENS_PER_TEMPLATE,
     ) -> Dict[str, Any]:
         """
         Generate insights asynchronously.
 
-        Uses semaphore to limit concurrent generations and prevent overwhelming the API.
+        Uses the admission controller to limit concurrent API calls; prompt building and
+        response parsing run outside it.
         """
 
-        async with self.semaphore:
-            # Build prompt
-            prompt = self.prompt_template.generation_prompt(
-                cohort=cohort,
-                insight_template=insight_template,
-                health_domains=health_domains,
-                sources=sources,
-                market=market,
-                num_insights=num_insights,
-            )
-
-            # Call LLM asynchronously
-            response = await self.llm.generate(prompt, model, temperature, max_tokens)
+        # Build prompt (CPU only, no concurrency slot needed). Sent as system
+        # (static, provider-cached) + user (cohort/template) messages.
+        prompt = self.prompt_template.generation_messages(
+            cohort=cohort,
+            insight_template=insight_template,
+            health_domains=health_domains,
+            sources=sources,
+            market=market,
+            num_insights=num_insights,
+        )
+
+        return await self._complete(
+            prompt, model, temperature, max_tokens, self.response_format, "insights"
+        )
+
+    async def generate_multi(
+        self,
+        cohort: dict,
+        insight_templates: List[dict],
+        health_domains: dict,
+        sources: dict,
+        market: str = "singapore",
+        num_insights: int = 5,
+        model: str = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Generate insights for several templates of one cohort in a single call.
 
-            # Parse response
-            return self._parse_json_response(response)
+        Args:
+            cohort: Cohort definition
+            insight_templates: Templates to cover in this call
+            health_domains: Health domains config
+            sources: Sources config
+            market: Market name
+            num_insights: Insights per template
+            model: Model to use
+            temperature: Sampling temperature
+            max_tokens: Output budget (default: the single-template budget
+                times the number of templates)
 
-    def _parse_json_response(self, response: str) -> Dict[str, Any]:
-        """Parse JSON from LLM response with automatic repair for common issues."""
-        response = response.strip()
+        Returns:
+            Mapping of template type to {"insights": [...]}, the same shape
+            generate() returns for one template. Templates missing from the
+            response are absent.
+        """
+        prompt = self.prompt_template.multi_generation_messages(
+            cohort=cohort,
+            insight_templates=insight_templates,
+            health_domains=health_domains,
+            sources=sources,
+            market=market,
+            num_insights=num_insights,
+        )
+        if max_tokens is None:
+            max_tokens = _MAX_TOKENS_PER_TEMPLATE * len(insight_templates)
+
+        parsed = await self._complete(
+            prompt,
+            model,
+            temperature,
+            max_tokens,
+            _MULTI_RESPONSE_FORMAT if self.response_format else None,
+            "results",
+        )
+
+        template_types = {t["type"] for t in insight_templates}
+        by_template = {}
+        results = parsed.get("results") if isinstance(parsed, dict) else None
+        for entry in results if isinstance(results, list) else []:
+            # Malformed entries are dropped, not allowed to fail the call
+            if not isinstance(entry, dict):
+                continue
+            template_id = entry.get("template_id")
+            if template_id in template_types and isinstance(
+                entry.get("insights"), list
+            ):
+                by_template[template_id] = {"insights": entry["insights"]}
+        return by_template
+
+    async def _complete(
+        self,
+        prompt: List[Dict[str, Any]],
+        model: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict[str, Any]],
+        result_key: str,
+    ) -> Any:
+        """Cached, admission-controlled LLM call returning the parsed JSON."""
+        # Only deterministic calls are cached unless explicitly forced
+        use_cache = self.cache is not None and (temperature <= 0 or self.force_cache)
+        if use_cache:
+            cache_key = ResponseCache.make_key(
+                [prompt, response_format],
+                model or self.llm.default_model,
+                temperature,
+                max_tokens,
+            )
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                return cached
 
-        # Remove markdown code blocks (common LLM behavior)
-        if response.startswith("```json"):
-            response = response[7:]
-        if response.startswith("```"):
-            response = response[3:]
-        if response.endswith("```"):
-            response = response[:-3]
+        # Hold a concurrency slot only for the network call
+        async with self.admission:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
 
-        response = response.strip()
+            response = await self.llm.generate(
+                prompt, model, temperature, max_tokens, response_format
+            )
 
-        # Try parsing original response
+        # Parse response (large ones off the event loop)
         try:
-            return json.loads(response)
-        except json.JSONDecodeError as e:
-            # Attempt automatic repairs for common LLM JSON errors
-            repaired = self._attempt_json_repair(response, e)
-
-            if repaired:
-                print(
-                    f"⚠️  Auto-repaired JSON (Insight Generator): {e.msg} at position {e.pos}"
-                )
-                try:
-                    return json.loads(repaired)
-                except json.JSONDecodeError:
-                    pass  # Repair failed, fall through to error logging
-
-            # Repair failed or not attempted - log detailed error
-            print("\n" + "=" * 80)
-            print("❌ JSON PARSE ERROR (Insight Generator)")
-            print("=" * 80)
-            print(f"Error: {e}")
-            print(f"Position: Line {e.lineno}, Column {e.colno}")
-
-            print("\n--- CONTEXT AROUND ERROR ---")
-            start = max(0, e.pos - 150)
-            end = min(len(response), e.pos + 150)
-            snippet = response[start:end]
-            pointer_pos = e.pos - start
-            print(snippet)
-            print(" " * pointer_pos + "^" * 10 + " ERROR HERE")
-
-            print("\n--- FULL RESPONSE ---")
-            print(response)
-            print("=" * 80 + "\n")
-
-            raise
-
-    def _attempt_json_repair(self, response: str, error: json.JSONDecodeError) -> str:
-        """
-        Attempt to repair common JSON formatting issues from LLM responses.
-
-        Common issues fixed:
-        1. Missing commas between object properties
-        2. Trailing commas before closing braces/brackets
-        3. Missing closing brackets/braces
+            if len(response) > _THREAD_PARSE_MIN_CHARS:
+                parsed = await asyncio.to_thread(self._parse_json_response, response)
+            else:
+                parsed = self._parse_json_response(response)
+        except ValueError:
+            if response_format:
+                self.schema_rejected_count += 1
+            # Keep whatever items did come through rather than losing the call
+            items = _salvage_items(response, result_key)
+            if not items:
+                raise
+            self.partial_recoveries += 1
+            logger.warning(
+                "Recovered %d %s item(s) from an unparseable response",
+                len(items),
+                result_key,
+            )
+            return {result_key: items}
 
-        Args:
-            response: The malformed JSON string
-            error: The JSONDecodeError with position information
+        if response_format and not (
+            isinstance(parsed, dict) and isinstance(parsed.get(result_key), list)
+        ):
+            self.schema_rejected_count += 1
 
-        Returns:
-            Repaired JSON string if repair was attempted, None otherwise
-        """
+        if use_cache:
+            await asyncio.to_thread(self.cache.put, cache_key, parsed)
 
-        # Only attempt repair for specific, fixable errors
-        error_msg = error.msg.lower()
+        return parsed
 
-        # Fix 1: Missing comma between properties
-        # Error: "Expecting ',' delimiter" or "Expecting property name"
-        if (
-            "expecting ',' delimiter" in error_msg
-            or "expecting property name" in error_msg
-        ):
-            # Check if there's a missing comma before a quote
-            pos = error.pos
-            if pos < len(response) and response[pos] == '"':
-                # Look backward to find the end of previous value
-                # Common pattern: }"key" should be },"key"
-                if pos > 0 and response[pos - 1] == "}":
-                    return response[:pos] + "," + response[pos:]
-                # Pattern: ]"key" should be ],"key"
-                if pos > 0 and response[pos - 1] == "]":
-                    return response[:pos] + "," + response[pos:]
-
-        # Fix 2: Trailing comma before closing brace/bracket
-        # Error: "Expecting property name" right after comma
-        if "expecting property name" in error_msg:
-            pos = error.pos
-            # Look backward for comma followed by whitespace and closing brace
-            check_start = max(0, pos - 10)
-            snippet = response[check_start : pos + 5]
-            if "," in snippet and ("}" in snippet or "]" in snippet):
-                # Find the trailing comma
-                for i in range(pos - 1, max(0, pos - 20), -1):
-                    if response[i] == ",":
-                        # Check if only whitespace between comma and closing brace
-                        after_comma = response[i + 1 : pos + 5].strip()
-                        if after_comma and after_comma[0] in ["}", "]"]:
-                            return response[:i] + response[i + 1 :]
-
-        # Fix 3: Missing closing braces/brackets (simple heuristic)
-        if "expecting" in error_msg and error.pos >= len(response) - 5:
-            # Count opening and closing braces
-            open_braces = response.count("{")
-            close_braces = response.count("}")
-            open_brackets = response.count("[")
-            close_brackets = response.count("]")
-
-            # Add missing closing characters
-            missing = ""
-            if close_brackets < open_brackets:
-                missing += "]" * (open_brackets - close_brackets)
-            if close_braces < open_braces:
-                missing += "}" * (open_braces - close_braces)
-
-            if missing:
-                return response + missing
-
-        # No repair attempted
-        return None
+    def _parse_json_response(self, response: str) -> Dict[str, Any]:
+        """Parse JSON from LLM response with automatic repair for common issues."""
+        return parse_json_response(response, "Insight Generator")
 
 
 if __name__ == "__main__":
     from src.utils.config_loader import ConfigLoader
+    from src.utils.event_loop import run
+    from src.utils.logging_setup import start_queue_logging
+    from src.utils.progress import ProgressReporter
     from dotenv import load_dotenv
     import time
     import datetime
     from pathlib import Path
-    import uuid
+    import os
 
     # Load environment variables
     load_dotenv(Path(__file__).parent.parent.parent / ".env")
 
+    def _write_line(f, record: dict):
+        """Append one record to an NDJSON file (opened in binary mode)."""
+        f.write(dumps_line(record))
+
+    def _new_ids(n: int) -> list:
+        """Mint n random 128-bit hex ids from a single urandom call."""
+        raw = os.urandom(16 * n)
+        return [raw[i : i + 16].hex() for i in range(0, len(raw), 16)]
+
     async def main():
         """Test concurrent generation."""
         market = "singapore"
@@ -213,123 +439,168 @@ if __name__ == "__main__":
         model = "arcee-ai/trinity-mini:free"
         prompt_template = PromptTemplates()
 
-        async with OpenRouterClient(model=model) as llm_client:
-            generator = InsightGenerator(llm_client, prompt_template, max_concurrent=5)
-
-            start_time = time.time()
-
-            # Create all generation tasks
-            gen_tasks = []
-            task_metadata = []  # Track which cohort+template each task corresponds to
-
-            # Run all generations concurrently
-            for cohort in cohorts[:2]:  # ONLY DO 2 COHORTS
-                for template in insight_templates.values():
-                    task = generator.generate(
-                        cohort=cohort,
-                        insight_template=template,
-                        health_domains=health_domains,
-                        sources=sources,
-                        market=market,
-                        num_insights=5,
-                        model=model,
-                        temperature=0.7,
-                        max_tokens=4000,
-                    )
-                    gen_tasks.append(task)
-                    task_metadata.append(
-                        {"cohort": cohort, "insight_template": template}
-                    )
-                    break  # WE ONLY DO 1 TEMPLATE FOR THIS
+        llm_client = OpenRouterClient(model=model)
+        async with InsightGenerator(
+            llm_client, prompt_template, max_concurrent=5
+        ) as generator:
 
-            print(f"Launching {len(gen_tasks)} generation tasks/calls...")
-            results = await asyncio.gather(*gen_tasks, return_exceptions=True)
+            start_time = time.monotonic()
 
-            duration = time.time() - start_time
+            # Stream insights to NDJSON as results arrive instead of holding
+            # them all in memory: first line is run metadata (including the
+            # cohort/template lookup tables), last is a summary
+            output_dir = Path("output")
+            output_dir.mkdir(parents=True, exist_ok=True)
 
-            # Print results
-            print(f"\nProcessed {len(results)} calls in {duration:.1f}s")
-            print("Total requests:", llm_client.total_requests)
-            print("Successful requests:", llm_client.successful_requests)
-            print("Failed requests:", llm_client.failed_requests)
+            started_at = datetime.datetime.now()
+            timestamp = started_at.strftime("%Y%m%d_%H%M%S")
+            output_file = output_dir / f"insights_{market}_{timestamp}.ndjson"
+
+            # Keep a bounded window of in-flight generations instead of
+            # creating every task up-front
+            window = 1000
+            selected_cohorts = cohorts[:2]  # ONLY DO 2 COHORTS
+            # One call per cohort covering every template
+            templates = list(insight_templates.values())
+            max_tokens = _MAX_TOKENS_PER_TEMPLATE * len(templates)
+            pending = iter(selected_cohorts)
+            task_to_meta = {}  # Task -> cohort metadata
+            total_calls = 0
 
             generation_successes = 0
             generation_failures = 0
+            num_insights = 0
+
+            with open(output_file, "wb", buffering=_OUTPUT_BUFFER_SIZE) as out:
+                _write_line(
+                    out,
+                    {
+                        "_meta": True,
+                        "market": market,
+                        "generation_model": model,
+                        "generation_temperature": 0.7,
+                        "max_tokens": max_tokens,
+                        "started_at": started_at.isoformat(),
+                        "num_cohorts": len(cohorts),
+                        "num_templates": len(insight_templates),
+                        # Lookup tables: insights reference these by key
+                        # instead of each carrying full copies
+                        "cohorts": {c["name"]: c for c in selected_cohorts},
+                        "insight_templates": {
+                            t["type"]: t for t in insight_templates.values()
+                        },
+                    },
+                )
+
+                # Pay for the static prompt block once before fanning out
+                await generator.warm_prompt_cache(
+                    health_domains, sources, market, model=model
+                )
+
+                print(f"Launching generation tasks (window={window})...")
+                progress = ProgressReporter("Generation calls", len(selected_cohorts))
+                while True:
+                    while len(task_to_meta) < window:
+                        cohort = next(pending, None)
+                        if cohort is None:
+                            break
+                        task = asyncio.create_task(
+                            generator.generate_multi(
+                                cohort=cohort,
+                                insight_templates=templates,
+                                health_domains=health_domains,
+                                sources=sources,
+                                market=market,
+                                num_insights=5,
+                                model=model,
+                                temperature=0.7,
+                                max_tokens=max_tokens,
+                            )
+                        )
+                        task_to_meta[task] = {"cohort": cohort}
+                        total_calls += 1
+
+                    if not task_to_meta:
+                        break
+
+                    done, _ = await asyncio.wait(
+                        task_to_meta, return_when=asyncio.FIRST_COMPLETED
+                    )
+
+                    # One timestamp per completed batch rather than per insight
+                    now_iso = datetime.datetime.now().isoformat()
+
+                    # Process generation results as they complete
+                    for task in done:
+                        metadata = task_to_meta.pop(task)
+                        result = task.exception() or task.result()
+
+                        if isinstance(result, Exception):
+                            generation_failures += 1
+                            logger.error("Generation failed: %s", str(result)[:100])
+                            continue
+                        if not result:
+                            generation_failures += 1
+                            logger.error("No template results in response")
+                            continue
 
-            # Process generation results
-            all_insights = []
-            for result, metadata in zip(results, task_metadata):
-                if isinstance(result, Exception):
-                    generation_failures += 1
-                    print(f"Generation failed: {str(result)[:100]}")
-                elif isinstance(result, dict) and "insights" in result:
-                    generation_successes += 1
-
-                    # Attach only varying metadata to each insight
-                    for insight in result["insights"]:
-                        insight["insight_id"] = str(uuid.uuid4())
-                        insight["cohort"] = metadata["cohort"]
-                        insight["cohort_name"] = metadata["cohort"]["name"]
-                        insight["insight_template"] = metadata["insight_template"]
-                        insight["insight_template_type"] = metadata["insight_template"][
-                            "type"
-                        ]
-                        insight["generation_model"] = model
-                        insight["generated_at"] = datetime.datetime.now().isoformat()
-                        all_insights.append(insight)
-                elif isinstance(result, list) and len(result) > 0:
-                    # Handle case where LLM returns list directly instead of {"insights": [...]}
-                    print(f"Got list instead of dict (length: {len(result)})")
-                    try:
-                        for insight in result:
-                            if isinstance(insight, dict):
-                                insight["cohort"] = metadata["cohort"]
-                                insight["insight_template"] = metadata[
-                                    "insight_template"
-                                ]
-                                insight["generation_model"] = model
-                                all_insights.append(insight)
-                            else:
-                                print(f"Skipping non-dict item: {type(insight)}")
                         generation_successes += 1
-                    except Exception as e:
-                        generation_failures += 1
-                        print(f"Failed to process list result: {str(e)[:100]}")
-                else:
-                    # Unexpected format
-                    generation_failures += 1
-                    print(f"Unexpected result format: {type(result)}")
-
-            print(f"\n✓ Generated {len(all_insights)} total insights")
-            print(f"✓ Success rate: {generation_successes}/{len(gen_tasks)}")
-
-            # Save to JSON with two-level metadata structure
-            output_dir = Path("output")
-            output_dir.mkdir(parents=True, exist_ok=True)
+                        missing = len(templates) - len(result)
+                        if missing:
+                            logger.warning(
+                                "%d template(s) missing from response", missing
+                            )
+
+                        for template_type, template_result in result.items():
+                            # Attach only varying metadata to each insight
+                            meta = {
+                                "cohort_name": metadata["cohort"]["name"],
+                                "insight_template_type": template_type,
+                                "generation_model": model,
+                                "generated_at": now_iso,
+                            }
+                            insights = template_result["insights"]
+                            insight_ids = _new_ids(len(insights))
+                            for insight, insight_id in zip(insights, insight_ids):
+                                insight["insight_id"] = insight_id
+                                insight.update(meta)
+                                _write_line(out, insight)
+                                num_insights += 1
+
+                    progress.update(len(done))
+
+                duration = time.monotonic() - start_time
+
+                _write_line(
+                    out,
+                    {
+                        "_summary": True,
+                        "generated_at": datetime.datetime.now().isoformat(),
+                        "total_calls": total_calls,
+                        "successful_calls": generation_successes,
+                        "failed_calls": generation_failures,
+                        "num_insights": num_insights,
+                        "duration_seconds": round(duration, 2),
+                    },
+                )
 
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = output_dir / f"insights_{market}_{timestamp}.json"
-
-            output_data = {
-                "generation_metadata": {
-                    "market": market,
-                    "generation_model": model,
-                    "generation_temperature": 0.7,
-                    "max_tokens": 4000,
-                    "generated_at": datetime.datetime.now().isoformat(),
-                    "num_cohorts": len(cohorts),
-                    "num_templates": len(insight_templates),
-                    "total_calls": len(gen_tasks),
-                    "successful_calls": generation_successes,
-                    "failed_calls": generation_failures,
-                    "duration_seconds": round(duration, 2),
-                },
-                "insights": all_insights,
-            }
-
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
+            # Print results
+            print(f"\nProcessed {total_calls} calls in {duration:.1f}s")
+            print("Total requests:", llm_client.total_requests)
+            print("Successful requests:", llm_client.successful_requests)
+            print("Failed requests:", llm_client.failed_requests)
+            print(
+                f"Cached prompt tokens: {llm_client.cached_prompt_tokens}"
+                f"/{llm_client.prompt_tokens}"
+            )
+            print("Schema rejected responses:", generator.schema_rejected_count)
 
+            print(f"\n✓ Generated {num_insights} total insights")
+            print(f"✓ Success rate: {generation_successes}/{total_calls}")
             print(f"\n✓ Saved to: {output_file}")
 
-    asyncio.run(main())
+    listener = start_queue_logging()
+    try:
+        run(main())
+    finally:
+        listener.stop()
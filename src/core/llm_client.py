@@ -4,45 +4,179 @@ Provides async HTTP client with rate limiting and retry logic.
 """
 
 import asyncio
-import aiohttp
+import httpx
+import logging
 import os
 import time
 import random
-from typing import Optional
+import json
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Union
+
+from src.utils.response_cache import ResponseCache
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on a single retry wait (backoff or server Retry-After)
+_MAX_RETRY_WAIT = 60.0
+
+# Statuses no later request can get past either (bad key, no credit, banned)
+_FATAL_STATUSES = frozenset({401, 402, 403})
+
+
+class FatalAPIError(Exception):
+    """API error that will fail every request, so callers should stop the batch."""
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delay in seconds or an HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
 
 
 class RateLimiter:
-    """Rate limiter for API calls."""
+    """
+    Rate limiter for API calls.
+
+    Two token buckets (per-minute and per-second) refilled lazily from the
+    elapsed time, so each check is O(1) regardless of the rate.
+
+    No lock is needed: the refill/check/decrement contains no await, so under
+    the single-threaded event loop it runs without interleaving.
+    """
 
     def __init__(self, requests_per_minute: int = 60, requests_per_second: int = 10):
         self.requests_per_minute = requests_per_minute
         self.requests_per_second = requests_per_second
-        self.minute_window = []
-        self.second_window = []
-        self.lock = asyncio.Lock()
+        self.minute_tokens = float(requests_per_minute)
+        self.second_tokens = float(requests_per_second)
+        self.last_refill = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self.last_refill
+        self.last_refill = now
+        self.minute_tokens = min(
+            self.requests_per_minute,
+            self.minute_tokens + elapsed * self.requests_per_minute / 60,
+        )
+        self.second_tokens = min(
+            self.requests_per_second,
+            self.second_tokens + elapsed * self.requests_per_second,
+        )
 
     async def acquire(self):
         """Wait until we can make another request."""
         while True:
-            async with self.lock:
-                now = time.time()
+            self._refill(time.monotonic())
+
+            # Check if we can proceed
+            if self.minute_tokens >= 1 and self.second_tokens >= 1:
+                self.minute_tokens -= 1
+                self.second_tokens -= 1
+                return
+
+            # Sleep until both buckets hold a whole token again, then re-check
+            wait = max(
+                (1 - self.minute_tokens) * 60 / self.requests_per_minute,
+                (1 - self.second_tokens) / self.requests_per_second,
+            )
+            await asyncio.sleep(wait)
+
+
+class AdmissionController:
+    """
+    Resizable concurrency limit (counter + asyncio.Condition).
+
+    Unlike asyncio.Semaphore, the limit can be changed while tasks are waiting.
+    on_success()/on_throttle() apply AIMD: the limit grows by one after
+    increase_after consecutive successes (up to max_limit) and halves on a 429.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        increase_after: int = 10,
+    ):
+        """
+        Initialize admission controller.
+
+        Args:
+            max_concurrent: Initial number of concurrent admissions
+            min_limit: Lower bound when backing off
+            max_limit: Upper bound when growing (defaults to max_concurrent)
+            increase_after: Consecutive successes before the limit grows by one
+        """
+        self._active = 0
+        self._cmax = max_concurrent
+        self._cond = asyncio.Condition()
+        self.min_limit = min_limit
+        self.max_limit = max_limit or max_concurrent
+        self.increase_after = increase_after
+        self._successes = 0
+
+    @property
+    def limit(self) -> int:
+        return self._cmax
+
+    async def acquire(self):
+        """Wait for a free slot."""
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self._cmax)
+            self._active += 1
+
+    async def release(self):
+        """Free a slot and wake one waiter."""
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify(1)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.release()
 
-                # Clean up old timestamps
-                self.minute_window = [t for t in self.minute_window if now - t < 60]
-                self.second_window = [t for t in self.second_window if now - t < 1]
+    async def set_limit(self, n: int):
+        """Change the concurrency limit; in-flight tasks are not interrupted."""
+        async with self._cond:
+            increased = n > self._cmax
+            self._cmax = n
+            if increased:
+                self._cond.notify_all()
 
-                # Check if we can proceed
-                if (
-                    len(self.minute_window) < self.requests_per_minute
-                    and len(self.second_window) < self.requests_per_second
-                ):
-                    # We're good to go!
-                    self.minute_window.append(now)
-                    self.second_window.append(now)
-                    return
+    async def on_success(self):
+        """Additive increase after a run of successful requests."""
+        self._successes += 1
+        if self._successes >= self.increase_after and self._cmax < self.max_limit:
+            self._successes = 0
+            await self.set_limit(self._cmax + 1)
 
-            # Need to wait - release lock and sleep
-            await asyncio.sleep(0.1)
+    async def on_throttle(self):
+        """Multiplicative decrease on a rate-limit response."""
+        self._successes = 0
+        new_limit = max(self.min_limit, self._cmax // 2)
+        if new_limit < self._cmax:
+            logger.info(f"Rate limited, reducing concurrency to {new_limit}")
+            await self.set_limit(new_limit)
 
 
 class OpenRouterClient:
@@ -54,7 +188,23 @@ class OpenRouterClient:
         api_key: Optional[str] = None,
         rate_limiter: Optional[RateLimiter] = None,
         max_retries: int = 5,
+        limit_per_host: int = 50,
+        keepalive_timeout: float = 75.0,
+        coalesce_inflight: bool = True,
     ):
+        """
+        Initialize OpenRouter client.
+
+        Args:
+            model: Default model to use
+            api_key: OpenRouter API key (defaults to OPENROUTER_API_KEY)
+            rate_limiter: Shared RateLimiter (a new one is created if omitted)
+            max_retries: Maximum attempts per request
+            limit_per_host: Maximum pooled connections to the API host
+            keepalive_timeout: Seconds to keep idle connections open for reuse
+            coalesce_inflight: Share one API call between concurrent identical
+                deterministic (temperature 0) generate() requests (singleflight)
+        """
         if not model:
             raise ValueError("Model not specified")
 
@@ -66,92 +216,191 @@ class OpenRouterClient:
         self.default_model = model
         self.rate_limiter = rate_limiter or RateLimiter()
         self.max_retries = max_retries
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.admission: Optional[AdmissionController] = None
+        self.coalesce_inflight = coalesce_inflight
+        self._inflight: Dict[str, asyncio.Future] = {}
         self._session = None
 
         # Statistics
         self.total_requests = 0
         self.successful_requests = 0
         self.failed_requests = 0
+        self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
+        self.coalesced_requests = 0
+
+    def attach_admission(self, admission: AdmissionController):
+        """Report request outcomes to admission so it can resize (AIMD)."""
+        self.admission = admission
 
     async def __aenter__(self):
-        self._session = aiohttp.ClientSession()
+        # HTTP/2 multiplexes concurrent requests over pooled keep-alive
+        # connections to the single API host, avoiding a TCP/TLS handshake
+        # per request under concurrent load
+        self._session = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(120.0),
+            limits=httpx.Limits(
+                max_connections=self.limit_per_host,
+                max_keepalive_connections=self.limit_per_host,
+                keepalive_expiry=self.keepalive_timeout,
+            ),
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "HTTP-Referer": "https://dyk-health-insights.com",
+            },
+        )
         return self
 
     async def __aexit__(self, *args):
         if self._session:
-            await self._session.close()
+            await self._session.aclose()
 
     async def generate(
         self,
-        prompt: str,
+        prompt: Union[str, List[Dict[str, Any]]],
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 4000,
+        response_format: Optional[Dict[str, Any]] = None,
     ) -> str:
         """
         Generate completion via OpenRouter (async).
 
         Args:
-            prompt: Input prompt
+            prompt: Input prompt, or a list of chat messages sent as-is
             model: Model to use
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
+            response_format: Optional structured-output spec (e.g. a JSON schema)
 
         Returns:
             Generated text response
         """
-        if not self._session:
-            raise RuntimeError("Client must be used as async context manager")
+        # Sampled (temperature > 0) calls are independent draws; sharing one
+        # reply between them would silently collapse their diversity
+        if not self.coalesce_inflight or temperature > 0:
+            return await self._generate(
+                prompt, model, temperature, max_tokens, response_format
+            )
 
-        # Wait for rate limiter
-        await self.rate_limiter.acquire()
+        # Concurrent identical requests await the same in-flight call
+        key = ResponseCache.make_fast_key(
+            [prompt, response_format],
+            model or self.default_model,
+            temperature,
+            max_tokens,
+        )
+        call = self._inflight.get(key)
+        if call is None:
+            call = asyncio.ensure_future(
+                self._generate(prompt, model, temperature, max_tokens, response_format)
+            )
+            self._inflight[key] = call
+            call.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced_requests += 1
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://dyk-health-insights.com",
-        }
+        # Shielded so one cancelled caller does not cancel the shared call
+        return await asyncio.shield(call)
+
+    async def _generate(
+        self,
+        prompt: Union[str, List[Dict[str, Any]]],
+        model: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict[str, Any]],
+    ) -> str:
+        """Send one completion request, with rate limiting and retries."""
+        if not self._session:
+            raise RuntimeError("Client must be used as async context manager")
 
         data = {
             "model": model or self.default_model,
-            "messages": [{"role": "user", "content": prompt}],
+            "messages": (
+                prompt
+                if isinstance(prompt, list)
+                else [{"role": "user", "content": prompt}]
+            ),
             "temperature": temperature,
             "max_tokens": max_tokens,
         }
+        if response_format:
+            data["response_format"] = response_format
 
         # Retry logic with exponential backoff
         for attempt in range(self.max_retries):
+            # Wait for rate limiter (retries count against the limit too)
+            await self.rate_limiter.acquire()
+
             try:
                 self.total_requests += 1
 
-                async with self._session.post(
-                    self.base_url,
-                    headers=headers,
-                    json=data,
-                    timeout=aiohttp.ClientTimeout(total=120),
-                ) as response:
-                    response.raise_for_status()
-                    result = await response.json()
-                    self.successful_requests += 1
-                    return result["choices"][0]["message"]["content"]
+                response = await self._session.post(self.base_url, json=data)
+                response.raise_for_status()
+                result = _loads(response.content)
+                self.successful_requests += 1
+                self._record_usage(result.get("usage"))
+                if self.admission:
+                    await self.admission.on_success()
+                return result["choices"][0]["message"]["content"]
 
             except Exception as e:
                 self.failed_requests += 1
 
                 # Don't retry client errors (400-499 except 429)
-                if isinstance(e, aiohttp.ClientResponseError):
-                    if 400 <= e.status < 500 and e.status != 429:
-                        raise Exception(f"Client error {e.status}: {str(e)}")
+                if isinstance(e, httpx.HTTPStatusError):
+                    status = e.response.status_code
+                    if status == 429 and self.admission:
+                        await self.admission.on_throttle()
+                    if status in _FATAL_STATUSES:
+                        raise FatalAPIError(f"Client error {status}: {str(e)}")
+                    if 400 <= status < 500 and status != 429:
+                        raise Exception(f"Client error {status}: {str(e)}")
 
                 if attempt < self.max_retries - 1:
-                    base_wait = 2**attempt  # Exponential backoff: 1s, 2s, 4s
-                    jitter = random.uniform(0, 0.5 * base_wait)
-                    wait_time = base_wait + jitter
-                    print(
-                        f"Retry {attempt + 1}/{self.max_retries} after {wait_time}s: {str(e)}"
+                    wait_time = self._retry_wait(attempt, e)
+                    logger.warning(
+                        "Retry %d/%d after %.1fs: %s",
+                        attempt + 1,
+                        self.max_retries,
+                        wait_time,
+                        e,
                     )
                     await asyncio.sleep(wait_time)
                 else:
                     raise Exception(
                         f"Failed after {self.max_retries} attempts: {str(e)}"
                     )
+
+    @staticmethod
+    def _retry_wait(attempt: int, error: Exception) -> float:
+        """
+        Seconds to wait before retrying after error.
+
+        A 429/503 carrying Retry-After waits as instructed (plus up to 1s of
+        jitter so concurrent callers do not retry in lockstep); otherwise
+        full-jitter exponential backoff: uniform over [0, 2**attempt] seconds,
+        with the ceiling capped at _MAX_RETRY_WAIT.
+        """
+        if isinstance(error, httpx.HTTPStatusError):
+            retry_after = _parse_retry_after(error.response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, _MAX_RETRY_WAIT) + random.uniform(0, 1)
+
+        return random.uniform(0, min(2**attempt, _MAX_RETRY_WAIT))
+
+    def _record_usage(self, usage: Optional[Dict[str, Any]]):
+        """Accumulate prompt token usage, including provider prompt-cache reads."""
+        if not usage:
+            return
+
+        self.prompt_tokens += usage.get("prompt_tokens") or 0
+        details = usage.get("prompt_tokens_details") or {}
+        cached = details.get("cached_tokens") or usage.get("cache_read_input_tokens")
+        if cached:
+            self.cached_prompt_tokens += cached
+            logger.debug(f"Prompt cache hit: {cached} cached input tokens")
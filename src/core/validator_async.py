@@ -4,10 +4,119 @@ Ensures insights conform to schema, have valid sources, and meet quality standar
 """
 
 import asyncio
-import aiohttp
+import httpx
+import ipaddress
 import json
-from typing import Dict, Any, List
-from urllib.parse import urlparse
+import random
+import time
+from collections import OrderedDict
+from contextlib import aclosing
+from functools import lru_cache
+from typing import Dict, Any, AsyncIterator, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from src.core.llm_client import AdmissionController, RateLimiter
+
+try:
+    import orjson
+
+    def _dumps(value: Any) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+except ImportError:
+    _dumps = json.dumps
+
+# Connection pool settings for the shared client
+_KEEPALIVE_TIMEOUT = 75.0
+
+# Per-phase timeouts so a stalled handshake or read fails fast
+_CONNECT_TIMEOUT = 1.5
+_READ_TIMEOUT = 2.0
+
+# Ranged GET used when a host rejects HEAD: asks for the first byte only
+_RANGE_HEADERS = {"Range": "bytes=0-0"}
+
+# Transient failures get one retry after a capped wait
+_URL_CHECK_ATTEMPTS = 2
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_MAX_RETRY_WAIT = 5.0
+
+# Batches at least this large run their CPU checks in a worker thread, one
+# chunk per hop, so URL checks for early chunks start while later ones run
+_THREAD_CHECKS_MIN_BATCH = 256
+_CHECKS_CHUNK_SIZE = 256
+
+# Fields every insight must carry, with their expected types
+_REQUIRED_FIELDS = {
+    "hook": str,
+    "explanation": str,
+    "action": str,
+    "source_name": str,
+    "source_url": str,
+    "numeric_claim": str,
+}
+
+# Maximum number of distinct source URLs whose check results are remembered
+_URL_CACHE_SIZE = 10_000
+
+
+# Source URLs that are rejected without a network request
+_HTTP_SCHEMES = frozenset({"http", "https"})
+_PLACEHOLDER_HOSTS = frozenset(
+    {"localhost", "example.com", "example.org", "example.net"}
+)
+
+
+def _preflight_issue(scheme: str, host: str) -> Optional[str]:
+    """Reason a URL cannot be a real public source, or None if it may be."""
+    if scheme.lower() not in _HTTP_SCHEMES:
+        return f"Unsupported URL scheme '{scheme}'"
+    if host.startswith("www."):
+        host = host[4:]
+    if host in _PLACEHOLDER_HOSTS:
+        return f"Placeholder host '{host}'"
+    try:
+        ipaddress.ip_address(host)
+        return f"IP address instead of a domain '{host}'"
+    except ValueError:
+        pass
+    if "." not in host:
+        return f"Invalid host '{host}'"
+    return None
+
+
+def _url_format_issue(url: str) -> Tuple[Optional[str], str]:
+    """
+    Network-free check of a source URL's format and host.
+
+    Shared by validation and quick_check so the two cannot disagree.
+
+    Returns:
+        (issue, host): issue is None if url is worth fetching
+    """
+    try:
+        # urlsplit memoizes its results (urlparse does not), so repeated
+        # source URLs are parsed only once
+        parsed = urlsplit(url)
+    except ValueError as e:
+        return f"Error parsing URL: {str(e)}", ""
+    if not parsed.scheme or not parsed.netloc:
+        return f"Invalid URL format: {url}", ""
+    host = parsed.hostname or ""
+    preflight = _preflight_issue(parsed.scheme, host)
+    if preflight:
+        # Obviously bogus: no network request needed
+        return f"{preflight}: {url}", host
+    return None, host
+
+
+@lru_cache(maxsize=_URL_CACHE_SIZE)
+def _normalize_url(url: str) -> str:
+    """Cache key for url: lowercase scheme/host, fragment dropped."""
+    parts = urlsplit(url)
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, "")
+    )
 
 
 class AsyncInsightValidator:
@@ -20,20 +129,110 @@ class AsyncInsightValidator:
     3. Source verification (valid and accessible URLs)
     """
 
-    def __init__(self, max_concurrent: int = 50):
+    def __init__(
+        self,
+        max_concurrent: int = 50,
+        session: Optional[httpx.AsyncClient] = None,
+        trusted_domains: Optional[Iterable[str]] = None,
+        url_cache_ttl: float = 3600.0,
+        per_host_rate: Optional[float] = 5.0,
+    ):
         """
         Initialize async validator.
 
         Args:
-            max_concurrent: Maximum number of concurrent validations (default: 50)
+            max_concurrent: Maximum number of concurrent URL checks (default: 50)
+            session: Shared httpx client to use for URL checks (its own
+                timeout applies). If None, an HTTP/2 client is created on
+                first use and closed by close()/__aexit__.
+            trusted_domains: Domains (and their subdomains) that need only one
+                successful HEAD per run; later URLs on a verified trusted host
+                are accepted without a request.
+            url_cache_ttl: Seconds a URL check result is reused (default: 3600)
+            per_host_rate: Maximum requests per second to any one host
+                (default: 5; None disables per-host rate limiting)
         """
         self.max_concurrent = max_concurrent
-        self.semaphore = asyncio.Semaphore(max_concurrent)
+        # HTTP/2 multiplexes many requests per connection, so the pool size
+        # does not bound concurrency; this does, and it halves on a 429
+        self.admission = AdmissionController(max_concurrent)
+        self._session = session
+        self._owns_session = session is None
+
+        # Normalized URL -> (task resolving to that URL's accessibility
+        # issues, monotonic expiry). Storing the task (not the result) lets
+        # concurrent checks of the same URL share one HEAD request.
+        self._url_cache: "OrderedDict[str, Tuple[asyncio.Future, float]]" = (
+            OrderedDict()
+        )
+        self.url_cache_ttl = url_cache_ttl
+        self.url_cache_hits = 0
+
+        self.trusted_domains = frozenset(d.lower() for d in trusted_domains or ())
+        self._verified_hosts = set()
+
+        # Host -> token bucket; admission bounds concurrency, these
+        # bound the request rate each site sees
+        self.per_host_rate = per_host_rate
+        self._host_limiters: Dict[str, RateLimiter] = {}
+
+    async def __aenter__(self):
+        self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def set_max_concurrent(self, n: int):
+        """
+        Change the URL check concurrency limit at runtime.
+
+        Checks already in flight finish normally; the new limit applies to
+        the next admissions and becomes the ceiling for growth after 429
+        backoff. A running batch never exceeds its own worker count.
+
+        Args:
+            n: New maximum number of concurrent URL checks
+        """
+        self.max_concurrent = n
+        self.admission.max_limit = n
+        await self.admission.set_limit(n)
+
+    def _get_session(self) -> httpx.AsyncClient:
+        """Return the shared client, creating a pooled one on first use."""
+        if self._session is None or self._session.is_closed:
+            # HTTP/2 carries concurrent checks to the same host as streams
+            # over one connection instead of one connection each
+            self._session = httpx.AsyncClient(
+                http2=True,
+                # No pool timeout: waiting for a free connection is not a
+                # failure of the URL being checked
+                timeout=httpx.Timeout(
+                    connect=_CONNECT_TIMEOUT,
+                    read=_READ_TIMEOUT,
+                    write=_READ_TIMEOUT,
+                    pool=None,
+                ),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrent,
+                    max_keepalive_connections=self.max_concurrent,
+                    keepalive_expiry=_KEEPALIVE_TIMEOUT,
+                ),
+            )
+            self._owns_session = True
+        return self._session
+
+    async def close(self):
+        """Close the client if this validator created it."""
+        if self._owns_session and self._session is not None:
+            await self._session.aclose()
+            self._session = None
 
     def _validate_json(self, insight: Dict[str, Any]) -> Dict[str, Any]:
         """Validate JSON serializability (synchronous)."""
         try:
-            json.dumps(insight)
+            # Output is discarded; orjson raises TypeError subclasses on failure
+            _dumps(insight)
             return {"passed": True, "issues": []}
         except (TypeError, ValueError) as e:
             return {
@@ -49,53 +248,58 @@ class AsyncInsightValidator:
         1. Required fields present
         2. Field types correct
         3. Field lengths within acceptable ranges
+
+        Never raises: a malformed insight is reported as issues.
         """
+        if not isinstance(insight, dict):
+            return {
+                "passed": False,
+                "issues": [
+                    f"Insight must be a JSON object, got {type(insight).__name__}."
+                ],
+            }
+
         issues = []
 
-        required_fields = {
-            "hook": str,
-            "explanation": str,
-            "action": str,
-            "source_name": str,
-            "source_url": str,
-            "numeric_claim": str,
-        }
+        # --- 1 & 2. Required fields and their types (single pass) ---
+        missing = []
+        type_issues = []
+        for field, expected_type in _REQUIRED_FIELDS.items():
+            if field not in insight:
+                missing.append(field)
+            elif not isinstance(insight[field], expected_type):
+                type_issues.append(
+                    f"Field '{field}' must be {expected_type.__name__}, "
+                    f"got {type(insight[field]).__name__}."
+                )
 
-        # --- 1. Required fields ---
-        missing = [f for f in required_fields if f not in insight]
         if missing:
             issues.append(f"Missing required fields: {missing}")
+        issues.extend(type_issues)
 
-        # --- 2. Field type checks ---
-        for field, expected_type in required_fields.items():
-            if field in insight:
-                if not isinstance(insight[field], expected_type):
-                    issues.append(
-                        f"Field '{field}' must be {expected_type.__name__}, "
-                        f"got {type(insight[field]).__name__}."
-                    )
-
-        # Check field lengths
-        if "hook" in insight:
+        # Check field lengths (wrong-typed fields were reported above)
+        if isinstance(insight.get("hook"), str):
             hook_words = len(insight["hook"].split())
             if hook_words > 20:
                 issues.append(f"Hook too long: {hook_words} words (max 20)")
 
-        if "explanation" in insight:
+        if isinstance(insight.get("explanation"), str):
             exp_words = len(insight["explanation"].split())
             if exp_words < 30 or exp_words > 60:
                 issues.append(
                     f"Explanation length suboptimal: {exp_words} words (target 40-60)"
                 )
 
-        if "action" in insight:
+        if isinstance(insight.get("action"), str):
             action_words = len(insight["action"].split())
             if action_words > 30:
                 issues.append(f"Action too long: {action_words} words (max 30)")
 
         return {"passed": len(issues) == 0, "issues": issues}
 
-    async def _validate_source(self, insight: Dict[str, Any]) -> Dict[str, Any]:
+    async def _validate_source(
+        self, insight: Dict[str, Any], use_cache: bool = True
+    ) -> Dict[str, Any]:
         """Validate source URL accessibility (async)."""
         issues = []
         warnings = []
@@ -111,51 +315,213 @@ class AsyncInsightValidator:
         elif source_url == "general medical knowledge":
             warnings.append("No specific source URL provided")
         else:
-            # Validate URL format
-            try:
-                parsed = urlparse(source_url)
-                if not parsed.scheme or not parsed.netloc:
-                    issues.append(f"Invalid URL format: {source_url}")
-                else:
-                    # Check URL accessibility (async) with semaphore
-                    async with self.semaphore:
-                        try:
-                            async with aiohttp.ClientSession() as session:
-                                async with session.head(
-                                    source_url,
-                                    timeout=aiohttp.ClientTimeout(total=5),
-                                    allow_redirects=True,
-                                ) as response:
-                                    if response.status >= 400:
-                                        issues.append(
-                                            f"Source URL not accessible, status code: {response.status}"
-                                        )
-                        except asyncio.TimeoutError:
-                            issues.append(f"Timeout accessing source URL: {source_url}")
-                        except Exception as e:
-                            issues.append(f"Error accessing source URL: {str(e)}")
+            format_issue, host = _url_format_issue(source_url)
+            if format_issue:
+                issues.append(format_issue)
+            elif not use_cache or host not in self._verified_hosts:
+                # Check URL accessibility (async, cached per URL)
+                url_issues = await self._check_url(source_url, use_cache)
+                issues.extend(url_issues)
+                if not url_issues and self._is_trusted(host):
+                    self._verified_hosts.add(host)
 
+        return {"passed": len(issues) == 0, "issues": issues, "warnings": warnings}
+
+    def _is_trusted(self, host: str) -> bool:
+        """True if host is a trusted domain or one of its subdomains."""
+        if not self.trusted_domains:
+            return False
+        parts = host.split(".")
+        return any(
+            ".".join(parts[i:]) in self.trusted_domains for i in range(len(parts))
+        )
+
+    async def _check_url(self, url: str, use_cache: bool = True) -> List[str]:
+        """
+        Return accessibility issues for url, reusing an unexpired earlier check
+        of it unless use_cache is False (the fresh result is still stored).
+        """
+        key = _normalize_url(url)
+        now = time.monotonic()
+        entry = self._url_cache.get(key) if use_cache else None
+        if entry is not None and now < entry[1]:
+            check = entry[0]
+            self._url_cache.move_to_end(key)
+            self.url_cache_hits += 1
+        else:
+            check = asyncio.ensure_future(self._probe_url(url))
+            self._url_cache[key] = (check, now + self.url_cache_ttl)
+            self._url_cache.move_to_end(key)
+            if len(self._url_cache) > _URL_CACHE_SIZE:
+                self._url_cache.popitem(last=False)
+
+        # Shield so one cancelled caller does not cancel a check others await
+        return list(await asyncio.shield(check))
+
+    async def _probe_url(self, url: str) -> List[str]:
+        """
+        Check url and report any accessibility issue.
+
+        A transient failure (429/5xx, timeout, connection error) is retried
+        once after a short jittered backoff, honouring Retry-After.
+        """
+        for attempt in range(_URL_CHECK_ATTEMPTS):
+            retries_left = attempt < _URL_CHECK_ATTEMPTS - 1
+            try:
+                status, retry_after = await self._fetch_status(url)
+            except httpx.TransportError as e:
+                if retries_left:
+                    await asyncio.sleep(self._retry_wait(attempt, None))
+                    continue
+                if isinstance(e, httpx.TimeoutException):
+                    return [f"Timeout accessing source URL: {url}"]
+                return [f"Error accessing source URL: {str(e)}"]
             except Exception as e:
-                issues.append(f"Error parsing URL: {str(e)}")
+                return [f"Error accessing source URL: {str(e)}"]
 
-        return {"passed": len(issues) == 0, "issues": issues, "warnings": warnings}
+            if status == 429:
+                await self.admission.on_throttle()
+            elif status < 400:
+                await self.admission.on_success()
 
-    async def validate(self, insight: Dict[str, Any]) -> Dict[str, Any]:
+            if status in _RETRY_STATUSES and retries_left:
+                await asyncio.sleep(self._retry_wait(attempt, retry_after))
+                continue
+            if status >= 400:
+                return [f"Source URL not accessible, status code: {status}"]
+            return []
+
+    async def _fetch_status(self, url: str) -> Tuple[int, Optional[str]]:
+        """
+        Return the HTTP status for url and its Retry-After header, if any.
+
+        Some hosts reject HEAD (405, 403, ...) for pages that exist, so a 4xx
+        other than 404/429 is confirmed with a one-byte ranged GET whose body
+        is never read.
+
+        Each request takes its host token before an admission slot, so URLs
+        waiting on a rate-limited host never hold slots other hosts could use.
+        """
+        session = self._get_session()
+        await self._wait_for_host(url)
+        async with self.admission:
+            response = await session.head(url, follow_redirects=True)
+        status = response.status_code
+        retry_after = response.headers.get("Retry-After")
+
+        if 400 <= status < 500 and status not in (404, 429):
+            await self._wait_for_host(url)
+            async with self.admission:
+                async with session.stream(
+                    "GET", url, headers=_RANGE_HEADERS, follow_redirects=True
+                ) as response:
+                    status = response.status_code
+                    retry_after = response.headers.get("Retry-After")
+
+        return status, retry_after
+
+    async def _wait_for_host(self, url: str):
+        """Wait for a request token from url's per-host bucket."""
+        if not self.per_host_rate:
+            return
+        host = urlsplit(url).netloc.lower()
+        limiter = self._host_limiters.get(host)
+        if limiter is None:
+            limiter = self._host_limiters[host] = RateLimiter(
+                requests_per_minute=self.per_host_rate * 60,
+                requests_per_second=self.per_host_rate,
+            )
+        await limiter.acquire()
+
+    @staticmethod
+    def _retry_wait(attempt: int, retry_after: Optional[str]) -> float:
+        """Seconds to wait before retrying: Retry-After seconds, else backoff."""
+        if retry_after:
+            try:
+                return min(max(0.0, float(retry_after)), _MAX_RETRY_WAIT)
+            except ValueError:
+                pass
+        return 0.25 * 2**attempt + random.uniform(0, 0.1)
+
+    async def validate(
+        self, insight: Dict[str, Any], use_cache: bool = True
+    ) -> Dict[str, Any]:
         """
         Comprehensive validation of a single insight (async).
 
         Args:
             insight: Insight dictionary to validate
+            use_cache: Reuse recent source URL checks (False forces a re-check)
 
         Returns:
-            Validation result with scores and issues
+            Validation result with scores and issues. If the JSON or schema
+            check fails, the source check is skipped (no network request)
+            and reported as failed.
         """
         # Run synchronous checks immediately
-        json_check = self._validate_json(insight)
-        schema_check = self._validate_schema(insight)
+        json_check, schema_check = self._local_checks(insight)
+        return await self._finish_validation(
+            insight, json_check, schema_check, use_cache
+        )
 
-        # Run async source check
-        source_check = await self._validate_source(insight)
+    def quick_check(self, insight: Dict[str, Any]) -> List[str]:
+        """
+        Run only the checks that need no network request (synchronous).
+
+        Covers JSON validity, schema conformity and the source URL format
+        (scheme, placeholder or IP hosts). Cheap enough to gate expensive
+        work, such as LLM evaluation, when full validation is skipped.
+
+        Args:
+            insight: Insight dictionary to check
+
+        Returns:
+            Issues found; an empty list does not guarantee that validate()
+            passes, since the URL itself is not fetched
+        """
+        json_check, schema_check = self._local_checks(insight)
+        issues = json_check["issues"] + schema_check["issues"]
+
+        source_url = insight.get("source_url") if isinstance(insight, dict) else None
+        if source_url == "":
+            issues.append("Missing source URL")
+        elif isinstance(source_url, str) and source_url != "general medical knowledge":
+            format_issue, _ = _url_format_issue(source_url)
+            if format_issue:
+                issues.append(format_issue)
+
+        return issues
+
+    def _local_checks(
+        self, insight: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Run the JSON and schema checks for one insight (synchronous)."""
+        return self._validate_json(insight), self._validate_schema(insight)
+
+    def _local_checks_batch(
+        self, insights: List[Dict[str, Any]]
+    ) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Run the JSON and schema checks for every insight (synchronous)."""
+        local_checks = self._local_checks
+        return [local_checks(insight) for insight in insights]
+
+    async def _finish_validation(
+        self,
+        insight: Dict[str, Any],
+        json_check: Dict[str, Any],
+        schema_check: Dict[str, Any],
+        use_cache: bool,
+    ) -> Dict[str, Any]:
+        """Add the source check to the local checks and build the result."""
+        # Run async source check only for an insight that can still pass
+        if json_check["passed"] and schema_check["passed"]:
+            source_check = await self._validate_source(insight, use_cache)
+        else:
+            source_check = {
+                "passed": False,
+                "issues": ["Skipped: JSON or schema check failed"],
+                "warnings": [],
+            }
 
         checks = {
             "json_validity": json_check,
@@ -172,21 +538,131 @@ class AsyncInsightValidator:
         }
 
     async def validate_batch(
-        self, insights: List[Dict[str, Any]]
+        self,
+        insights: List[Dict[str, Any]],
+        use_cache: bool = True,
+        window: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         Validate multiple insights in parallel.
 
         Args:
             insights: List of insights to validate
+            use_cache: Reuse recent source URL checks (False forces a re-check)
+            window: Number of workers (default: max_concurrent)
 
         Returns:
-            List of validation results (or exceptions if failed)
+            List of validation results in input order. Checks report problems
+            as issues rather than raising, so every entry is a result dict.
+        """
+        results: List[Any] = [None] * len(insights)
+        stream = self.validate_stream(insights, use_cache, window)
+        async with aclosing(stream):
+            async for index, result in stream:
+                results[index] = result
+        return results
+
+    async def validate_stream(
+        self,
+        insights: List[Dict[str, Any]],
+        use_cache: bool = True,
+        window: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
         """
-        tasks = [self.validate(insight) for insight in insights]
+        Validate multiple insights, yielding each result as soon as it is ready.
 
-        # return_exceptions=True means one failure won't stop the others
-        return await asyncio.gather(*tasks, return_exceptions=True)
+        Closing the generator early (e.g. with contextlib.aclosing) cancels
+        the validations still in flight.
+
+        Args:
+            insights: List of insights to validate
+            use_cache: Reuse recent source URL checks (False forces a re-check)
+            window: Number of workers (default: max_concurrent)
+
+        Yields:
+            (index, result) pairs in completion order, where index is the
+            insight's position in `insights`
+        """
+        finished: asyncio.Queue = asyncio.Queue()
+        runner = asyncio.create_task(
+            self._run_batch(insights, use_cache, window, finished)
+        )
+        try:
+            while True:
+                item = await finished.get()
+                if item is None:
+                    break
+                yield item
+            # Surface a failure that ended the batch early
+            await runner
+        finally:
+            runner.cancel()
+
+    async def _run_batch(
+        self,
+        insights: List[Dict[str, Any]],
+        use_cache: bool,
+        window: Optional[int],
+        finished: asyncio.Queue,
+    ):
+        """
+        Validate insights with a worker pool, reporting to a queue.
+
+        A fixed pool of `window` workers pulls insights from a shared
+        iterator, so only that many validations exist at a time however
+        large the batch is. For large batches the CPU checks run in a worker
+        thread chunk by chunk, ahead of the workers, so they neither stall
+        in-flight URL checks nor hold back the first results.
+
+        Args:
+            insights: List of insights to validate
+            use_cache: Reuse recent source URL checks
+            window: Number of workers (default: max_concurrent)
+            finished: Receives (index, result) per insight, then None once
+                the batch has ended (normally or not)
+        """
+        pending = enumerate(insights)
+
+        chunks = None
+        if len(insights) >= _THREAD_CHECKS_MIN_BATCH:
+            loop = asyncio.get_running_loop()
+            chunks = [
+                loop.create_future()
+                for _ in range(0, len(insights), _CHECKS_CHUNK_SIZE)
+            ]
+
+        async def check_chunks():
+            # One thread hop per chunk; per-insight hops would cost more
+            # than the microseconds of work each one moves
+            for number, chunk in enumerate(chunks):
+                start = number * _CHECKS_CHUNK_SIZE
+                chunk.set_result(
+                    await asyncio.to_thread(
+                        self._local_checks_batch,
+                        insights[start : start + _CHECKS_CHUNK_SIZE],
+                    )
+                )
+
+        async def worker():
+            for index, insight in pending:
+                if chunks is None:
+                    result = await self.validate(insight, use_cache)
+                else:
+                    number, offset = divmod(index, _CHECKS_CHUNK_SIZE)
+                    local_checks = (await chunks[number])[offset]
+                    result = await self._finish_validation(
+                        insight, *local_checks, use_cache
+                    )
+                finished.put_nowait((index, result))
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                if chunks is not None:
+                    tg.create_task(check_chunks())
+                for _ in range(min(window or self.max_concurrent, len(insights))):
+                    tg.create_task(worker())
+        finally:
+            finished.put_nowait(None)
 
 
 # Example usage
@@ -240,24 +716,23 @@ if __name__ == "__main__":
         print(f"Validating {len(insights)} insights...")
         print("=" * 80 + "\n")
 
-        validator = AsyncInsightValidator(max_concurrent=10)
+        async with AsyncInsightValidator(max_concurrent=10) as validator:
+            # Test 1: Validate single insight
+            print("[TEST 1] Single validation...")
+            start = time.monotonic()
+            result = await validator.validate(insights[0])
+            duration = time.monotonic() - start
 
-        # Test 1: Validate single insight
-        print("[TEST 1] Single validation...")
-        start = time.time()
-        result = await validator.validate(insights[0])
-        duration = time.time() - start
+            print(f"✓ Completed in {duration:.2f}s")
+            print(f"Validated: {result['validated']}")
+            print(f"Failed checks: {result['number_failed']}\n")
 
-        print(f"✓ Completed in {duration:.2f}s")
-        print(f"Validated: {result['validated']}")
-        print(f"Failed checks: {result['number_failed']}\n")
+            # Test 2: Validate batch in parallel
+            print(f"[TEST 2] Batch validation ({len(insights)} insights)...")
 
-        # Test 2: Validate batch in parallel
-        print(f"[TEST 2] Batch validation ({len(insights)} insights)...")
-
-        start = time.time()
-        results = await validator.validate_batch(insights)
-        duration = time.time() - start
+            start = time.monotonic()
+            results = await validator.validate_batch(insights)
+            duration = time.monotonic() - start
 
         print(f"✓ Completed {len(results)} validations in {duration:.2f}s")
         print(f"Average: {duration/len(results):.2f}s per insight\n")
@@ -270,20 +745,17 @@ if __name__ == "__main__":
         for i, (insight, result) in enumerate(zip(insights, results), 1):
             print(f"\n[{i}] {insight['hook'][:60]}...")
 
-            if isinstance(result, Exception):
-                print(f"    ✗ ERROR: {result}")
+            if result["validated"]:
+                print(f"    ✓ PASSED")
             else:
-                if result["validated"]:
-                    print(f"    ✓ PASSED")
-                else:
-                    print(f"    ✗ FAILED ({result['number_failed']} checks failed)")
-
-                    # Show which checks failed
-                    for check_name, check_result in result["checks"].items():
-                        if not check_result["passed"]:
-                            print(f"      - {check_name}:")
-                            for issue in check_result["issues"]:
-                                print(f"          • {issue}")
+                print(f"    ✗ FAILED ({result['number_failed']} checks failed)")
+
+                # Show which checks failed
+                for check_name, check_result in result["checks"].items():
+                    if not check_result["passed"]:
+                        print(f"      - {check_name}:")
+                        for issue in check_result["issues"]:
+                            print(f"          • {issue}")
 
         print("\n" + "=" * 80)
         print(f"✓ Async validation test complete!")
@@ -3,7 +3,7 @@
 End-to-end DYK insight generation workflow.
 
 Steps:
-1. Generate cohorts
+1. Load priority cohorts
 2. Generate insights via LLM for each cohort and sampled health domain + sampled insight template
 3. Validate each insight
 4. Evaluate insights for quality (only for those which pass validation)
@@ -15,6 +15,7 @@ Metadata is appended throughout the pipeline including:
 - Evaluation details
 """
 
+import asyncio
 import os
 import sys
 import json
@@ -31,17 +32,50 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from dotenv import load_dotenv
 
 # Import core modules
-from src.core.cohort_generator import CohortGenerator
 from src.core.insight_generator import InsightGenerator, OpenRouterClient
-from src.core.validator import InsightValidator
+from src.core.llm_client import FatalAPIError, RateLimiter
+from src.core.validator_async import AsyncInsightValidator
 from src.core.evaluator import InsightEvaluator
-from src.services.pubmed_service import EvidenceRetriever, PubMedAPI
 from src.prompts.prompt_templates import PromptTemplates
+from src.utils import event_loop
 from src.utils.config_loader import ConfigLoader
+from src.utils.json_parsing import dump_json, dump_json_records, encode_record
 
 # Load environment variables
 load_dotenv(Path(__file__).parent.parent / ".env")
 
+# Evaluation criteria exported as score columns, in CSV column order
+_CSV_SCORE_CRITERIA = (
+    "factual_accuracy",
+    "safety",
+    "source_faithfulness",
+    "relevance",
+    "actionability",
+    "cultural_appropriateness",
+)
+
+# Insight fields the evaluation prompt reads
+_EVALUATED_FIELDS = ("hook", "explanation", "action", "source_name", "source_url")
+
+
+def _evaluation_fingerprint(insight: Dict[str, Any]) -> tuple:
+    """
+    Key under which two insights would get the same evaluation prompt.
+
+    Text is compared with whitespace and case normalized, so copies that
+    differ only in spacing or capitalization share one evaluation.
+    """
+    metadata = insight["metadata"]
+    text = (
+        " ".join(str(insight.get(field, "")).split()).casefold()
+        for field in _EVALUATED_FIELDS
+    )
+    return (
+        *text,
+        metadata["cohort"].get("name"),
+        metadata["insight_template"].get("type"),
+    )
+
 
 class DYKPipeline:
     """End-to-end DYK insight generation pipeline."""
@@ -50,8 +84,6 @@ class DYKPipeline:
         self,
         market: str = "singapore",
         openrouter_api_key: Optional[str] = None,
-        pubmed_email: Optional[str] = None,
-        pubmed_api_key: Optional[str] = None,
         generation_model: str = "x-ai/grok-4.1-fast",
         evaluation_model: str = "x-ai/grok-4.1-fast",
         generation_temperature: float = 0.7,
@@ -63,8 +95,6 @@ class DYKPipeline:
         Args:
             market: Target market/region
             openrouter_api_key: OpenRouter API key
-            pubmed_email: Email for PubMed API
-            pubmed_api_key: PubMed API key (optional)
             model: LLM model to use
             generation_temperature: LLM temperature for generation
             generation_max_tokens: Maximum tokens for LLM generation
@@ -82,10 +112,7 @@ class DYKPipeline:
         # Initialize components
         print("Initializing pipeline components...")
 
-        # 1. Cohort Generator
-        self.cohort_generator = CohortGenerator(market=market)
-
-        # 2. LLM Clients
+        # 1. LLM Clients
         api_key = openrouter_api_key or os.getenv("OPENROUTER_API_KEY")
         if not api_key:
             raise ValueError(
@@ -94,35 +121,22 @@ class DYKPipeline:
         self.gen_llm = OpenRouterClient(model=generation_model, api_key=api_key)
         self.eval_llm = OpenRouterClient(model=evaluation_model, api_key=api_key)
 
-        # 3. Evidence Retriever
-        email = pubmed_email or os.getenv("PUBMED_EMAIL")
-        pubmed_api_key = pubmed_api_key or os.getenv("PUBMED_API_KEY")
-
-        if email and pubmed_api_key:
-            pubmed_client = PubMedAPI(email=email, api_key=pubmed_api_key)
-            self.evidence_retriever = EvidenceRetriever(
-                pubmed_client=pubmed_client, max_results=5
-            )
-        else:
-            print("  Warning: No PubMed email provided, evidence retrieval disabled")
-            self.evidence_retriever = None
-
-        # 4. Prompt Templates
+        # 2. Prompt Templates
         self.prompt_templates = PromptTemplates()
 
-        # 5. Insight Generator
+        # 3. Insight Generator
         self.insight_generator = InsightGenerator(
-            llm_client=self.gen_llm,
-            evidence_retriever=self.evidence_retriever,
-            prompt_template=self.prompt_templates,
+            llm_client=self.gen_llm, prompt_template=self.prompt_templates
         )
 
-        # 6. Validator
-        self.validator = InsightValidator()
+        # 4. Validator (configured evidence sources need one check per host)
+        self.validator = AsyncInsightValidator(
+            trusted_domains=self.config_loader.source_domains
+        )
 
-        # 7. Evaluator
+        # 5. Evaluator
         self.evaluator = InsightEvaluator(
-            llm=self.eval_llm, prompt_templates=self.prompt_templates
+            llm_client=self.eval_llm, prompt_template=self.prompt_templates
         )
 
         # Pipeline statistics
@@ -132,6 +146,8 @@ class DYKPipeline:
             "total_insights_generated": 0,
             "total_insights_validated": 0,
             "total_insights_evaluated": 0,
+            "duplicate_evaluations_skipped": 0,
+            "evaluations_prefiltered": 0,
             "validation_pass_rate": 0.0,
             "average_evaluation_score": 0.0,
             "start_time": None,
@@ -149,9 +165,33 @@ class DYKPipeline:
         skip_evaluation: bool = False,
         output_dir: str = "output",
         rate_limit_delay: float = 1.0,
+        templates_per_call: int = 1,
+    ) -> Dict[str, Any]:
+        """Run the complete pipeline to completion; see run_async()."""
+        return event_loop.run(
+            self.run_async(
+                max_cohorts=max_cohorts,
+                insights_per_call=insights_per_call,
+                skip_validation=skip_validation,
+                skip_evaluation=skip_evaluation,
+                output_dir=output_dir,
+                rate_limit_delay=rate_limit_delay,
+                templates_per_call=templates_per_call,
+            )
+        )
+
+    async def run_async(
+        self,
+        max_cohorts: Optional[int] = None,
+        insights_per_call: int = 5,
+        skip_validation: bool = False,
+        skip_evaluation: bool = False,
+        output_dir: str = "output",
+        rate_limit_delay: float = 1.0,
+        templates_per_call: int = 1,
     ) -> Dict[str, Any]:
         """
-        Run the complete pipeline.
+        Run the complete pipeline (async).
 
         Args:
             max_cohorts: Maximum number of cohorts to process (None = all)
@@ -161,13 +201,23 @@ class DYKPipeline:
             skip_validation: Skip validation step
             skip_evaluation: Skip evaluation step
             output_dir: Output directory for results
-            rate_limit_delay: Delay between API calls (seconds)
+            rate_limit_delay: Average delay between API calls (seconds, 0 = no cap)
+            templates_per_call: Templates of one cohort covered by a single
+                LLM call (1 = one call per combination)
 
         Returns:
             Pipeline summary with statistics
         """
+        if rate_limit_delay > 0:
+            # Steps run one after another, so both clients share one budget
+            rate_limiter = RateLimiter(
+                requests_per_minute=max(1, round(60 / rate_limit_delay))
+            )
+            self.gen_llm.rate_limiter = rate_limiter
+            self.eval_llm.rate_limiter = rate_limiter
+
         self.stats["start_time"] = datetime.now().isoformat()
-        start_time = time.time()
+        start_time = time.monotonic()
 
         print("\n" + "=" * 80)
         print("DYK INSIGHT GENERATION PIPELINE")
@@ -182,19 +232,25 @@ class DYKPipeline:
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
 
-        # Step 1: Generate cohorts
-        print("[STEP 1] Generating cohorts...")
-        cohorts = self.cohort_generator.generate_priority_cohorts()
+        # Insight files are written in worker threads while the next step's
+        # API calls run; every write is awaited before the final summary
+        pending_writes = []
+
+        def save_in_background(write, *args):
+            pending_writes.append(asyncio.create_task(asyncio.to_thread(write, *args)))
+
+        # Step 1: Load priority cohorts
+        print("[STEP 1] Loading cohorts...")
+        cohorts = self.config_loader.priority_cohorts
         if max_cohorts:
             cohorts = cohorts[:max_cohorts]
 
         self.stats["total_cohorts"] = len(cohorts)
-        print(f"  Generated {len(cohorts)} cohorts")
+        print(f"  Loaded {len(cohorts)} cohorts")
 
         # Save cohorts
         cohorts_file = os.path.join(output_dir, "cohorts.json")
-        with open(cohorts_file, "w") as f:
-            json.dump(cohorts, f, indent=2)
+        dump_json(cohorts_file, cohorts)
         print(f"  Saved to {cohorts_file}\n")
 
         insight_templates = self.config_loader.insight_templates
@@ -210,112 +266,63 @@ class DYKPipeline:
 
         # Step 2: Generate insights for all combinations
         print("[STEP 2] Generating insights...")
-        all_insights = []
-        sources = self.config_loader.sources
-
-        combination_idx = 0
-        for cohort in cohorts:
-            for insight_template in insight_templates.values():
-                combination_idx += 1
-                print(
-                    f"  [{combination_idx}/{total_combinations}] "
-                    f"Cohort: {cohort['cohort_id']} | "
-                    f"Template: {insight_template['type']} | "
-                )
-
-                try:
-                    # Generate insights
-                    insights_data = self.insight_generator.generate(
-                        cohort=cohort,
-                        insight_template=insight_template,
-                        health_domains=health_domains,
-                        sources=sources,
-                        region=self.market,
-                        num_insights=insights_per_call,
-                        model=self.generation_model,
-                        temperature=self.generation_temperature,
-                        max_tokens=self.generation_max_tokens,
-                    )
-
-                    # Parse insights (handle both list and dict responses)
-                    if isinstance(insights_data, dict) and "insights" in insights_data:
-                        insights_list = insights_data["insights"]
-                    elif isinstance(insights_data, list):
-                        insights_list = insights_data
-                    else:
-                        insights_list = [insights_data]
-
-                    # Add metadata to each insight
-                    for insight in insights_list:
-                        insight["metadata"] = {
-                            "cohort": cohort,
-                            "insight_template": insight_template,
-                            "region": self.market,
-                            "generation_model": self.generation_model,
-                            "generation_temperature": self.generation_temperature,
-                            "generation_max_tokens": self.generation_max_tokens,
-                            "generation_timestamp": datetime.now().isoformat(),
-                        }
-                        all_insights.append(insight)
-
-                    print(f"Generated {len(insights_list)} insights")
-                    self.stats["total_insights_generated"] += len(insights_list)
-
-                except Exception as e:
-                    print(f"ERROR: {str(e)}")
-
-                # Rate limiting
-                time.sleep(rate_limit_delay)
+        all_insights = await self._generate_all(
+            cohorts=cohorts,
+            insight_templates=list(insight_templates.values()),
+            health_domains=health_domains,
+            sources=self.config_loader.source_names,
+            insights_per_call=insights_per_call,
+            templates_per_call=templates_per_call,
+        )
 
         print(f"\n  Total insights generated: {len(all_insights)}\n")
 
         # Save raw insights
         raw_insights_file = os.path.join(output_dir, "insights_raw.json")
-        with open(raw_insights_file, "w") as f:
-            json.dump(
-                {
-                    "generated_at": datetime.now().isoformat(),
-                    "total_insights": len(all_insights),
-                    "insights": all_insights,
-                },
-                f,
-                indent=2,
-            )
-        print(f"  Saved raw insights to {raw_insights_file}\n")
+        # Shallow copies: validation adds a key to each insight meanwhile
+        save_in_background(
+            dump_json_records,
+            raw_insights_file,
+            {
+                "generated_at": datetime.now().isoformat(),
+                "total_insights": len(all_insights),
+            },
+            map(encode_record, [dict(insight) for insight in all_insights]),
+        )
+        print(f"  Saving raw insights to {raw_insights_file}\n")
 
         # Step 3: Validate insights
         validated_insights = []
         if not skip_validation:
             print("[STEP 3] Validating insights...")
-            for idx, insight in enumerate(all_insights, 1):
-                print(f"[{idx}/{len(all_insights)}] Validating insight...")
-
-                try:
-                    validation_result = self.validator.validate(insight)
-                    insight["validation"] = {
-                        "validated": validation_result["validated"],
-                        "number_failed": validation_result["number_failed"],
-                        "checks": validation_result["checks"],
-                        "validation_timestamp": datetime.now().isoformat(),
-                    }
-
-                    if validation_result["validated"]:
-                        validated_insights.append(insight)
-                        print("PASS")
-                    else:
-                        print(
-                            f"FAIL - {validation_result['number_failed']} checks failed"
-                        )
+            # URL checks run concurrently; the validator's own limits bound them
+            async with self.validator:
+                validation_results = await self.validator.validate_batch(
+                    all_insights
+                )
 
-                    self.stats["total_insights_validated"] += 1
+            # One timestamp for the whole batch: results arrive together
+            validation_timestamp = datetime.now().isoformat()
+            for idx, (insight, validation_result) in enumerate(
+                zip(all_insights, validation_results), 1
+            ):
+                insight["validation"] = {
+                    "validated": validation_result["validated"],
+                    "number_failed": validation_result["number_failed"],
+                    "checks": validation_result["checks"],
+                    "validation_timestamp": validation_timestamp,
+                }
+
+                if validation_result["validated"]:
+                    validated_insights.append(insight)
+                    print(f"[{idx}/{len(all_insights)}] PASS")
+                else:
+                    print(
+                        f"[{idx}/{len(all_insights)}] FAIL - "
+                        f"{validation_result['number_failed']} checks failed"
+                    )
 
-                except Exception as e:
-                    print(f"ERROR during validation: {str(e)}")
-                    insight["validation"] = {
-                        "validated": False,
-                        "error": str(e),
-                        "validation_timestamp": datetime.now().isoformat(),
-                    }
+                self.stats["total_insights_validated"] += 1
 
             self.stats["validation_pass_rate"] = (
                 len(validated_insights) / len(all_insights) * 100
@@ -332,36 +339,50 @@ class DYKPipeline:
             all_validated_file = os.path.join(
                 output_dir, "insights_post_validation.json"
             )
-            with open(all_validated_file, "w") as f:
-                json.dump(
-                    {
-                        "generated_at": datetime.now().isoformat(),
-                        "total_insights": len(all_insights),
-                        "passed": len(validated_insights),
-                        "failed": len(all_insights) - len(validated_insights),
-                        "insights": all_insights,
-                    },
-                    f,
-                    indent=2,
-                )
-            print(f"Saved all insights after validation to {all_validated_file}")
-
             # Save only validated insights (passed)
             validated_insights_file = os.path.join(
                 output_dir, "insights_validated.json"
             )
-            with open(validated_insights_file, "w") as f:
-                json.dump(
+            generated_at = datetime.now().isoformat()
+
+            def save_validation_outputs(insights: List[Dict[str, Any]]):
+                # Each insight is serialized once: passed ones are kept
+                # encoded for the passed-only file written next
+                validated_encoded = []
+
+                def encode_all():
+                    for insight in insights:
+                        encoded = encode_record(insight)
+                        if insight["validation"]["validated"]:
+                            validated_encoded.append(encoded)
+                        yield encoded
+
+                dump_json_records(
+                    all_validated_file,
+                    {
+                        "generated_at": generated_at,
+                        "total_insights": len(insights),
+                        "passed": len(validated_insights),
+                        "failed": len(insights) - len(validated_insights),
+                    },
+                    encode_all(),
+                )
+                dump_json_records(
+                    validated_insights_file,
                     {
-                        "generated_at": datetime.now().isoformat(),
+                        "generated_at": generated_at,
                         "total_insights": len(validated_insights),
-                        "insights": validated_insights,
                     },
-                    f,
-                    indent=2,
+                    validated_encoded,
                 )
+
+            # Shallow copies: evaluation adds a key to passed insights meanwhile
+            save_in_background(
+                save_validation_outputs, [dict(insight) for insight in all_insights]
+            )
+            print(f"Saving all insights after validation to {all_validated_file}")
             print(
-                f"Saved validated insights (passed only) to {validated_insights_file}\n"
+                f"Saving validated insights (passed only) to {validated_insights_file}\n"
             )
         else:
             validated_insights = all_insights
@@ -373,94 +394,142 @@ class DYKPipeline:
             print("[STEP 4] Evaluating insights...")
             evaluation_scores = []
 
-            for idx, insight in enumerate(validated_insights, 1):
-                print(f"[{idx}/{len(validated_insights)}] Evaluating insight...")
+            to_evaluate = []
+            prefiltered = []
+            prefilter_timestamp = datetime.now().isoformat()
+            for insight in validated_insights:
+                metadata = insight["metadata"]
+                if not (metadata.get("cohort") and metadata.get("insight_template")):
+                    print("SKIP - Missing metadata")
+                    continue
+                issues = self.validator.quick_check(insight) if skip_validation else []
+                if issues:
+                    # Unvalidated and already failing the network-free
+                    # checks: not worth an LLM call, but kept in the output
+                    # with the reason
+                    insight["evaluation"] = {
+                        "skipped": "pre-filter",
+                        "issues": issues,
+                        "evaluation_timestamp": prefilter_timestamp,
+                    }
+                    prefiltered.append(insight)
+                else:
+                    to_evaluate.append(insight)
 
-                try:
-                    # Get cohort and template info from metadata
-                    cohort = insight["metadata"].get("cohort")
-                    insight_template = insight["metadata"].get("insight_template")
+            self.stats["evaluations_prefiltered"] = len(prefiltered)
+            if prefiltered:
+                print(
+                    f"  SKIP - {len(prefiltered)} insights fail schema/source checks"
+                )
 
-                    if cohort and insight_template:
-                        evaluation_result = self.evaluator.evaluate(
-                            insight=insight,
-                            cohort=cohort,
-                            insight_template=insight_template,
-                            region=self.market,
-                            model=self.evaluation_model,
-                            temperature=0.3,  # Lower temperature for evaluation
-                            max_tokens=3000,  # Sufficient tokens for evaluation
+            # Evaluate each distinct insight once; duplicates from different
+            # calls reuse the result of the first copy
+            first_copy = {}  # fingerprint -> position in distinct
+            distinct = []
+            copy_of = []
+            for insight in to_evaluate:
+                position = first_copy.setdefault(
+                    _evaluation_fingerprint(insight), len(distinct)
+                )
+                if position == len(distinct):
+                    distinct.append(insight)
+                copy_of.append(position)
+
+            duplicates = len(to_evaluate) - len(distinct)
+            self.stats["duplicate_evaluations_skipped"] = duplicates
+            if duplicates:
+                print(f"  {duplicates} duplicate insights share an evaluation")
+
+            # evaluate_batch reads cohort and template from the top level;
+            # shallow copies leave the saved insights unchanged
+            async with self.eval_llm:
+                distinct_results = await self.evaluator.evaluate_batch(
+                    [
+                        dict(
+                            insight,
+                            cohort=insight["metadata"]["cohort"],
+                            insight_template=insight["metadata"]["insight_template"],
                         )
+                        for insight in distinct
+                    ],
+                    market=self.market,
+                    model=self.evaluation_model,
+                    temperature=0.3,  # Lower temperature for evaluation
+                    max_tokens=3000,  # Sufficient tokens for evaluation
+                )
+            evaluation_results = [distinct_results[position] for position in copy_of]
 
-                        # Parse evaluation result
-                        if isinstance(evaluation_result, str):
-                            try:
-                                evaluation_result = json.loads(evaluation_result)
-                            except json.JSONDecodeError:
-                                evaluation_result = {"raw_response": evaluation_result}
-
-                        insight["evaluation"] = {
-                            "result": evaluation_result,
-                            "evaluation_model": self.evaluation_model,
-                            "evaluation_timestamp": datetime.now().isoformat(),
-                        }
-
-                        # Try to extract score
-                        if isinstance(evaluation_result, dict):
-                            score = evaluation_result.get(
-                                "overall_score", evaluation_result.get("score")
-                            )
-                            if score is not None:
-                                evaluation_scores.append(float(score))
-                                print(f"Evaluation Score: {score}")
-                            else:
-                                print("Evaluated (no numeric score)")
-                        else:
-                            print("Evaluated (not a dictionary result)")
-
-                        evaluated_insights.append(insight)
-                        self.stats["total_insights_evaluated"] += 1
-
-                    else:
-                        print("SKIP - Missing metadata")
-
-                    # Rate limiting
-                    time.sleep(rate_limit_delay)
+            # One timestamp for the whole batch: results arrive together
+            evaluation_timestamp = datetime.now().isoformat()
+            for idx, (insight, evaluation_result) in enumerate(
+                zip(to_evaluate, evaluation_results), 1
+            ):
+                print(f"[{idx}/{len(to_evaluate)}] ", end="")
 
-                except Exception as e:
-                    print(f"ERROR during evaluation: {str(e)}")
+                if isinstance(evaluation_result, Exception):
+                    print(f"ERROR during evaluation: {str(evaluation_result)}")
                     insight["evaluation"] = {
-                        "error": str(e),
-                        "evaluation_timestamp": datetime.now().isoformat(),
+                        "error": str(evaluation_result),
+                        "evaluation_timestamp": evaluation_timestamp,
                     }
                     evaluated_insights.append(insight)
-
+                    continue
+
+                # Parse evaluation result
+                if isinstance(evaluation_result, str):
+                    try:
+                        evaluation_result = json.loads(evaluation_result)
+                    except json.JSONDecodeError:
+                        evaluation_result = {"raw_response": evaluation_result}
+
+                insight["evaluation"] = {
+                    "result": evaluation_result,
+                    "evaluation_model": self.evaluation_model,
+                    "evaluation_timestamp": evaluation_timestamp,
+                }
+
+                # Try to extract score
+                if isinstance(evaluation_result, dict):
+                    score = evaluation_result.get(
+                        "overall_score", evaluation_result.get("score")
+                    )
+                    try:
+                        evaluation_scores.append(float(score))
+                        print(f"Evaluation Score: {score}")
+                    except (TypeError, ValueError):
+                        print("Evaluated (no numeric score)")
+                else:
+                    print("Evaluated (not a dictionary result)")
+
+                evaluated_insights.append(insight)
+                self.stats["total_insights_evaluated"] += 1
+
+            # Pre-filtered insights are saved too, but take no part in the
+            # average score
+            evaluated_insights.extend(prefiltered)
+
+            evaluated_count = self.stats["total_insights_evaluated"]
             if evaluation_scores:
                 self.stats["average_evaluation_score"] = sum(evaluation_scores) / len(
                     evaluation_scores
                 )
-                print(
-                    f"\nEvaluation complete: {len(evaluated_insights)} insights evaluated"
-                )
+                print(f"\nEvaluation complete: {evaluated_count} insights evaluated")
                 print(f"Average score: {self.stats['average_evaluation_score']:.2f}\n")
             else:
-                print(
-                    f"\nEvaluation complete: {len(evaluated_insights)} insights evaluated\n"
-                )
+                print(f"\nEvaluation complete: {evaluated_count} insights evaluated\n")
 
             # Save evaluated insights
             evaluated_insights_file = os.path.join(output_dir, "insights_final.json")
-            with open(evaluated_insights_file, "w") as f:
-                json.dump(
-                    {
-                        "generated_at": datetime.now().isoformat(),
-                        "total_insights": len(evaluated_insights),
-                        "insights": evaluated_insights,
-                    },
-                    f,
-                    indent=2,
-                )
-            print(f"Saved final insights to {evaluated_insights_file}\n")
+            save_in_background(
+                dump_json_records,
+                evaluated_insights_file,
+                {
+                    "generated_at": datetime.now().isoformat(),
+                    "total_insights": len(evaluated_insights),
+                },
+                map(encode_record, evaluated_insights),
+            )
+            print(f"Saving final insights to {evaluated_insights_file}\n")
         else:
             evaluated_insights = validated_insights
             if skip_evaluation:
@@ -469,7 +538,7 @@ class DYKPipeline:
                 print("[STEP 4] No validated insights to evaluate\n")
 
         # Calculate final statistics
-        end_time = time.time()
+        end_time = time.monotonic()
         self.stats["end_time"] = datetime.now().isoformat()
         self.stats["duration_seconds"] = end_time - start_time
 
@@ -483,6 +552,7 @@ class DYKPipeline:
                 "generation_max_tokens": self.generation_max_tokens,
                 "max_cohorts": max_cohorts,
                 "insights_per_call": insights_per_call,
+                "templates_per_call": templates_per_call,
                 "region": self.market,
                 "skip_validation": skip_validation,
                 "skip_evaluation": skip_evaluation,
@@ -504,8 +574,8 @@ class DYKPipeline:
         }
 
         summary_file = os.path.join(output_dir, "pipeline_summary.json")
-        with open(summary_file, "w") as f:
-            json.dump(summary, f, indent=2)
+        save_in_background(dump_json, summary_file, summary)
+        await asyncio.gather(*pending_writes)
 
         # Print final summary
         print("=" * 80)
@@ -537,6 +607,147 @@ class DYKPipeline:
 
         return summary
 
+    async def _generate_all(
+        self,
+        cohorts: List[Dict[str, Any]],
+        insight_templates: List[Dict[str, Any]],
+        health_domains: Dict[str, Any],
+        sources: Dict[str, Any],
+        insights_per_call: int,
+        templates_per_call: int = 1,
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate insights for every cohort/template combination concurrently.
+
+        Calls are bounded by the generator's admission controller and paced
+        by the client's rate limiter, so slow responses overlap instead of
+        running back to back.
+
+        Args:
+            cohorts: Cohorts to generate for
+            insight_templates: Templates to combine with each cohort
+            health_domains: Health domains config
+            sources: Sources config
+            insights_per_call: Number of insights per template
+            templates_per_call: Templates of one cohort covered by a single
+                LLM call (1 = one call per combination)
+
+        Returns:
+            Generated insights with metadata, in combination order
+        """
+        # Each call covers one cohort and a run of its templates; every call
+        # shares the same cached system block however they are grouped
+        calls = [
+            (cohort, insight_templates[start : start + templates_per_call])
+            for cohort in cohorts
+            for start in range(0, len(insight_templates), templates_per_call)
+        ]
+        print(f"  LLM calls: {len(calls)}")
+
+        async def _generate_one(index: int, cohort: dict, templates: list):
+            # Failures are returned, not raised, so one failed call does not
+            # cancel the rest; a fatal API error does, since every other call
+            # would fail the same way
+            try:
+                if len(templates) == 1:
+                    result = {
+                        templates[0]["type"]: await self.insight_generator.generate(
+                            cohort=cohort,
+                            insight_template=templates[0],
+                            health_domains=health_domains,
+                            sources=sources,
+                            market=self.market,
+                            num_insights=insights_per_call,
+                            model=self.generation_model,
+                            temperature=self.generation_temperature,
+                            max_tokens=self.generation_max_tokens,
+                        )
+                    }
+                else:
+                    result = await self.insight_generator.generate_multi(
+                        cohort=cohort,
+                        insight_templates=templates,
+                        health_domains=health_domains,
+                        sources=sources,
+                        market=self.market,
+                        num_insights=insights_per_call,
+                        model=self.generation_model,
+                        temperature=self.generation_temperature,
+                        max_tokens=self.generation_max_tokens * len(templates),
+                    )
+            except FatalAPIError:
+                raise
+            except Exception as e:
+                result = e
+            return index, cohort, templates, result
+
+        # Per-call slots keep the output order stable
+        insights_by_call = [[] for _ in calls]
+        async with self.insight_generator:
+            # Write the static prompt block to the provider cache once, so
+            # the concurrent calls read it instead of each paying for it
+            await self.insight_generator.warm_prompt_cache(
+                health_domains, sources, self.market, model=self.generation_model
+            )
+
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    tg.create_task(_generate_one(i, cohort, templates))
+                    for i, (cohort, templates) in enumerate(calls)
+                ]
+
+                for done, next_done in enumerate(asyncio.as_completed(tasks), 1):
+                    index, cohort, templates, result = await next_done
+                    # One timestamp per completed call rather than per insight
+                    generation_timestamp = datetime.now().isoformat()
+
+                    for insight_template in templates:
+                        print(
+                            f"  [{done}/{len(calls)}] "
+                            f"Cohort: {cohort['name']} | "
+                            f"Template: {insight_template['type']} | ",
+                            end="",
+                        )
+
+                        if isinstance(result, Exception):
+                            print(f"ERROR: {str(result)}")
+                            continue
+
+                        insights_data = result.get(insight_template["type"])
+                        if insights_data is None:
+                            print("ERROR: No insights returned for this template")
+                            continue
+
+                        # Parse insights (handle both list and dict responses)
+                        if (
+                            isinstance(insights_data, dict)
+                            and "insights" in insights_data
+                        ):
+                            insights_list = insights_data["insights"]
+                        elif isinstance(insights_data, list):
+                            insights_list = insights_data
+                        else:
+                            insights_list = [insights_data]
+
+                        # Add metadata to each insight (own copy, built once)
+                        metadata = {
+                            "cohort": cohort,
+                            "insight_template": insight_template,
+                            "region": self.market,
+                            "generation_model": self.generation_model,
+                            "generation_temperature": self.generation_temperature,
+                            "generation_max_tokens": self.generation_max_tokens,
+                            "generation_timestamp": generation_timestamp,
+                        }
+                        for insight in insights_list:
+                            insight["metadata"] = dict(metadata)
+                        insights_by_call[index].extend(insights_list)
+
+                        print(f"Generated {len(insights_list)} insights")
+                        self.stats["total_insights_generated"] += len(insights_list)
+
+        return [insight for insights in insights_by_call for insight in insights]
+
     def _export_to_csv(
         self, insights: List[Dict[str, Any]], output_dir: str
     ) -> Optional[str]:
@@ -589,74 +800,56 @@ class DYKPipeline:
                     ]
                 )
 
-                for idx, insight in enumerate(insights, 1):
-                    # Extract metadata
-                    metadata = insight.get("metadata", {})
-                    cohort = metadata.get("cohort", {})
-                    template = metadata.get("insight_template", {})
-                    eval = insight.get("evaluation", {})
-                    eval_result = eval.get("result", {})
-
-                    writer.writerow(
-                        [
-                            " ".join(
-                                [
-                                    insight.get("hook", ""),
-                                    insight.get("explanation", ""),
-                                    insight.get("action", ""),
-                                ]
-                            ),  # full insight
-                            insight.get("hook", ""),  # hook
-                            insight.get("explanation", ""),  # explanation
-                            insight.get("action", ""),  # action
-                            insight.get("source_name", ""),  # source name
-                            insight.get("source_url", ""),  # source url
-                            cohort.get("cohort_params", ""),  # cohort params
-                            cohort.get("description", ""),  # cohort desc
-                            template.get("type", ""),  # insight_template
-                            metadata.get("generation_model", ""),  # generation model
-                            metadata.get(
-                                "generation_temperature", ""
-                            ),  # generation temperature
-                            metadata.get(
-                                "generation_max_tokens", ""
-                            ),  # generation max tokens
-                            metadata.get(
-                                "generation_timestamp", ""
-                            ),  # generation timestamp
-                            eval_result.get("overall_score", ""),  # eval overall score
-                            eval_result.get("factual_accuracy", {}).get(
-                                "score", ""
-                            ),  # factual accuracy score
-                            eval_result.get("safety", {}).get(
-                                "score", ""
-                            ),  # safety score
-                            eval_result.get("source_faithfulness", {}).get(
-                                "score", ""
-                            ),  # faithfulness score
-                            eval_result.get("relevance", {}).get(
-                                "score", ""
-                            ),  # relevance score
-                            eval_result.get("actionability", {}).get(
-                                "score", ""
-                            ),  # actionability score
-                            eval_result.get("cultural_appropriateness", {}).get(
-                                "score", ""
-                            ),  # culture appropriateness score
-                            eval_result.get("recommendation", ""),  # recommendation
-                            eval_result.get(
-                                "revision_suggestions", ""
-                            ),  # revision suggestions
-                            eval.get("evaluation_model", ""),  # eval model
-                            eval.get("evaluation_timestamp", ""),  # eval timestamp
-                        ]
-                    )
+                # Rows are built lazily and handed to the C writer in one
+                # writerows() call instead of one writerow() per insight
+                writer.writerows(self._csv_row(insight) for insight in insights)
 
             print(f"\n✓ Exported {len(insights)} insights to CSV")
         except Exception as e:
             print(f"Error exporting to CSV: {e}")
             return None
 
+        return csv_file
+
+    @staticmethod
+    def _csv_row(insight: Dict[str, Any]) -> List[Any]:
+        """Flatten one insight into the columns written by _export_to_csv()."""
+        get = insight.get
+        metadata = get("metadata", {})
+        cohort = metadata.get("cohort", {})
+        template = metadata.get("insight_template", {})
+        eval = get("evaluation", {})
+        eval_result = eval.get("result", {})
+        hook = get("hook", "")
+        explanation = get("explanation", "")
+        action = get("action", "")
+
+        return [
+            " ".join([hook, explanation, action]),  # full insight
+            hook,
+            explanation,
+            action,
+            get("source_name", ""),
+            get("source_url", ""),
+            cohort.get("dimensions", ""),  # cohort params
+            cohort.get("description", ""),  # cohort desc
+            template.get("type", ""),  # insight_template
+            metadata.get("generation_model", ""),
+            metadata.get("generation_temperature", ""),
+            metadata.get("generation_max_tokens", ""),
+            metadata.get("generation_timestamp", ""),
+            eval_result.get("overall_score", ""),  # eval overall score
+            # Per-criterion scores
+            *(
+                eval_result.get(criterion, {}).get("score", "")
+                for criterion in _CSV_SCORE_CRITERIA
+            ),
+            eval_result.get("recommendation", ""),
+            eval_result.get("revision_suggestions", ""),
+            eval.get("evaluation_model", ""),
+            eval.get("evaluation_timestamp", ""),
+        ]
+
     # def run(
     #     self,
     #     max_cohorts: Optional[int] = None,
@@ -1139,6 +1332,12 @@ def main():
         default=1.0,
         help="Delay between API calls in seconds (default: 1.0)",
     )
+    parser.add_argument(
+        "--templates_per_call",
+        type=int,
+        default=1,
+        help="Templates of one cohort generated in a single LLM call (default: 1)",
+    )
 
     args = parser.parse_args()
 
@@ -1161,6 +1360,7 @@ def main():
             skip_evaluation=args.skip_evaluation,
             output_dir=args.output_dir,
             rate_limit_delay=args.rate_limit_delay,
+            templates_per_call=args.templates_per_call,
         )
 
         print("\nPipeline completed successfully!")
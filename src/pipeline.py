@@ -10,23 +10,30 @@ Pipeline Flow:
 """
 
 import asyncio
-import json
+import csv
+import logging
 import time
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import argparse
 from dotenv import load_dotenv
 import networkx as nx
 
-from src.core.llm_client import OpenRouterClient, RateLimiter
+from src.core.llm_client import FatalAPIError, OpenRouterClient, RateLimiter
 from src.core.insight_generator import InsightGenerator
 from src.core.deduplicator import InsightDeduplicator
 from src.core.creative_rewriter import CreativeRewriter
 from src.core.evaluator import InsightEvaluator
 from src.prompts.prompt_templates import PromptTemplates
 from src.utils.config_loader import ConfigLoader
+from src.utils.json_parsing import dump_json
+from src.utils.event_loop import run
+from src.utils.logging_setup import start_queue_logging
+from src.utils.progress import ProgressReporter
+
+logger = logging.getLogger(__name__)
 
 load_dotenv(Path(__file__).parent.parent / ".env")
 
@@ -48,6 +55,8 @@ class DYKPipeline:
         evaluation_temperature: float = 0.3,
         requests_per_minute: int = 60,
         requests_per_second: int = 10,
+        cache_dir: Optional[str] = None,
+        force_cache: bool = False,
     ):
         """
         Initialize async pipeline.
@@ -65,6 +74,8 @@ class DYKPipeline:
             evaluation_temperature: Temperature for evaluation (default: 0.3)
             requests_per_minute: API rate limit per minute
             requests_per_second: API rate limit per second
+            cache_dir: Directory for the LLM response cache (None = no caching)
+            force_cache: Also cache non-deterministic (temperature > 0) calls
         """
         self.market = market
         self.generation_model = generation_model
@@ -76,6 +87,8 @@ class DYKPipeline:
         self.generation_temperature = generation_temperature
         self.creative_temperature = creative_temperature
         self.evaluation_temperature = evaluation_temperature
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.force_cache = force_cache
 
         # Load config
         self.loader = ConfigLoader(market=market)
@@ -131,7 +144,7 @@ class DYKPipeline:
         Returns:
             List of evaluated insights with creative variations
         """
-        pipeline_start = time.time()
+        pipeline_start = time.monotonic()
 
         print("\n" + "=" * 80)
         print("DYK COMPLETE PIPELINE")
@@ -164,7 +177,7 @@ class DYKPipeline:
         # STEP 2: Generate Insights
         # ========================================
         print("[STEP 2] Generating insights...")
-        gen_start = time.time()
+        gen_start = time.monotonic()
 
         async with OpenRouterClient(
             model=self.generation_model, rate_limiter=self.rate_limiter
@@ -173,15 +186,16 @@ class DYKPipeline:
                 llm_client=gen_client,
                 prompt_template=self.prompt_templates,
                 max_concurrent=self.max_concurrent_generations,
+                cache_dir=self.cache_dir,
+                force_cache=self.force_cache,
             )
 
-            # Create generation tasks
-            generation_tasks = []
-            task_metadata = []
-
-            for cohort in cohorts:
-                for template in insight_templates.values():
-                    task = generator.generate(
+            async def _generate_one(index: int, cohort: dict, template: dict):
+                # Failures are returned, not raised, so one failed call does
+                # not cancel the rest of the task group; a fatal API error
+                # does, since every other call would fail the same way
+                try:
+                    result = await generator.generate(
                         cohort=cohort,
                         insight_template=template,
                         health_domains=health_domains,
@@ -192,36 +206,65 @@ class DYKPipeline:
                         temperature=self.generation_temperature,
                         max_tokens=6000,
                     )
-                    generation_tasks.append(task)
-                    task_metadata.append(
-                        {"cohort": cohort, "insight_template": template}
-                    )
+                except FatalAPIError:
+                    raise
+                except Exception as e:
+                    result = e
+                return index, cohort, template, result
+
+            combinations = [
+                (cohort, template)
+                for cohort in cohorts
+                for template in insight_templates.values()
+            ]
+            self.stats["generation_attempts"] = len(combinations)
+
+            # Pay for the static prompt block once before fanning out
+            await generator.warm_prompt_cache(
+                health_domains, sources, self.market, model=self.generation_model
+            )
+            print(f"Launching {len(combinations)} generation tasks...")
+
+            # Attach metadata as each call completes; insights are kept in
+            # per-call slots so the final order (and dedup result) is stable
+            insights_by_call = [[] for _ in combinations]
+            progress = ProgressReporter("Generation calls", len(combinations))
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    tg.create_task(_generate_one(i, cohort, template))
+                    for i, (cohort, template) in enumerate(combinations)
+                ]
 
-            self.stats["generation_attempts"] = len(generation_tasks)
-            print(f"Launching {len(generation_tasks)} generation tasks...")
+                for next_done in asyncio.as_completed(tasks):
+                    index, cohort, template, result = await next_done
+
+                    if isinstance(result, Exception):
+                        self.stats["generation_failures"] += 1
+                        logger.error("Generation failed: %s", str(result)[:100])
+                    elif isinstance(result, dict) and "insights" in result:
+                        self.stats["generation_successes"] += 1
+
+                        # Metadata shared by every insight of this call
+                        meta = {
+                            "cohort": cohort,
+                            "insight_template": template,
+                            "generation_model": self.generation_model,
+                            "generated_at": datetime.now().isoformat(),
+                        }
+                        for insight in result["insights"]:
+                            insight["insight_id"] = str(uuid.uuid4())
+                            insight.update(meta)
+                        insights_by_call[index] = result["insights"]
 
-            results = await asyncio.gather(*generation_tasks, return_exceptions=True)
+                    progress.update()
 
-        gen_duration = time.time() - gen_start
+        gen_duration = time.monotonic() - gen_start
         self.stats["generation_time"] = gen_duration
         generation_timestamp = datetime.now().isoformat()
 
-        # Process generation results
-        all_insights = []
-        for result, metadata in zip(results, task_metadata):
-            if isinstance(result, Exception):
-                self.stats["generation_failures"] += 1
-                print(f"Generation failed: {str(result)[:100]}")
-            elif isinstance(result, dict) and "insights" in result:
-                self.stats["generation_successes"] += 1
-
-                for insight in result["insights"]:
-                    insight["insight_id"] = str(uuid.uuid4())
-                    insight["cohort"] = metadata["cohort"]
-                    insight["insight_template"] = metadata["insight_template"]
-                    insight["generation_model"] = self.generation_model
-                    insight["generated_at"] = generation_timestamp
-                    all_insights.append(insight)
+        all_insights = [
+            insight for insights in insights_by_call for insight in insights
+        ]
 
         self.stats["total_insights_generated"] = len(all_insights)
 
@@ -239,7 +282,7 @@ class DYKPipeline:
         # STEP 3: Deduplicate Insights
         # ========================================
         print(f"[STEP 3] Deduplicating insights (threshold={dedup_threshold})...")
-        dedup_start = time.time()
+        dedup_start = time.monotonic()
 
         deduplicator = InsightDeduplicator(
             insights=all_insights,
@@ -269,7 +312,7 @@ class DYKPipeline:
         ]  # Keep first from each cluster
         unique_insights = [all_insights[i] for i in sorted(unique_indices)]
 
-        dedup_duration = time.time() - dedup_start
+        dedup_duration = time.monotonic() - dedup_start
         self.stats["deduplication_time"] = dedup_duration
         self.stats["deduplication_threshold"] = dedup_threshold
         self.stats["unique_insights_after_dedup"] = len(unique_insights)
@@ -291,7 +334,7 @@ class DYKPipeline:
         # STEP 4: Creative Rewriting
         # ========================================
         print(f"[STEP 4] Creating {num_variations} creative variations per insight...")
-        creative_start = time.time()
+        creative_start = time.monotonic()
 
         async with OpenRouterClient(
             model=self.creative_model, rate_limiter=self.rate_limiter
@@ -302,27 +345,32 @@ class DYKPipeline:
                 max_concurrent=self.max_concurrent_creative,
             )
 
-            creative_tasks = [
-                rewriter.rewrite(
-                    insight=insight,
-                    cohort=insight["cohort"],
-                    market=self.market,
-                    num_variations=num_variations,
-                    model=self.creative_model,
-                    temperature=self.creative_temperature,
-                    max_tokens=6000,
-                )
-                for insight in unique_insights
-            ]
+            async def _rewrite_one(index: int, insight: dict):
+                # Same failure handling as _generate_one
+                try:
+                    creative_results[index] = await rewriter.rewrite(
+                        insight=insight,
+                        cohort=insight["cohort"],
+                        market=self.market,
+                        num_variations=num_variations,
+                        model=self.creative_model,
+                        temperature=self.creative_temperature,
+                        max_tokens=6000,
+                    )
+                except FatalAPIError:
+                    raise
+                except Exception as e:
+                    creative_results[index] = e
 
-            self.stats["creative_attempts"] = len(creative_tasks)
-            print(f"Launching {len(creative_tasks)} creative rewriting tasks...")
+            creative_results: List[Any] = [None] * len(unique_insights)
+            self.stats["creative_attempts"] = len(unique_insights)
+            print(f"Launching {len(unique_insights)} creative rewriting tasks...")
 
-            creative_results = await asyncio.gather(
-                *creative_tasks, return_exceptions=True
-            )
+            async with asyncio.TaskGroup() as tg:
+                for i, insight in enumerate(unique_insights):
+                    tg.create_task(_rewrite_one(i, insight))
 
-        creative_duration = time.time() - creative_start
+        creative_duration = time.monotonic() - creative_start
         self.stats["creative_time"] = creative_duration
         creative_timestamp = datetime.now().isoformat()
 
@@ -331,7 +379,7 @@ class DYKPipeline:
         for insight, result in zip(unique_insights, creative_results):
             if isinstance(result, Exception):
                 self.stats["creative_failures"] += 1
-                print(f"Creative rewriting failed: {str(result)[:100]}")
+                logger.error("Creative rewriting failed: %s", str(result)[:100])
             elif isinstance(result, dict) and "variations" in result:
                 self.stats["creative_successes"] += 1
 
@@ -375,7 +423,7 @@ class DYKPipeline:
         # STEP 5: Evaluate Variations
         # ========================================
         print(f"[STEP 5] Evaluating {len(all_variations)} variations...")
-        eval_start = time.time()
+        eval_start = time.monotonic()
 
         async with OpenRouterClient(
             model=self.evaluation_model, rate_limiter=self.rate_limiter
@@ -384,27 +432,22 @@ class DYKPipeline:
                 llm_client=eval_client,
                 prompt_template=self.prompt_templates,
                 max_concurrent=self.max_concurrent_evaluations,
+                cache_dir=self.cache_dir,
+                force_cache=self.force_cache,
             )
 
-            eval_tasks = [
-                evaluator.evaluate(
-                    insight=variation,
-                    cohort=variation["cohort"],
-                    insight_template=variation["insight_template"],
-                    market=self.market,
-                    model=self.evaluation_model,
-                    temperature=self.evaluation_temperature,
-                    max_tokens=6000,
-                )
-                for variation in all_variations
-            ]
+            self.stats["evaluation_attempts"] = len(all_variations)
+            print(f"Launching {len(all_variations)} evaluation tasks...")
 
-            self.stats["evaluation_attempts"] = len(eval_tasks)
-            print(f"Launching {len(eval_tasks)} evaluation tasks...")
-
-            eval_results = await asyncio.gather(*eval_tasks, return_exceptions=True)
+            eval_results = await evaluator.evaluate_batch(
+                all_variations,
+                market=self.market,
+                model=self.evaluation_model,
+                temperature=self.evaluation_temperature,
+                max_tokens=6000,
+            )
 
-        eval_duration = time.time() - eval_start
+        eval_duration = time.monotonic() - eval_start
         self.stats["evaluation_time"] = eval_duration
         evaluation_timestamp = datetime.now().isoformat()
 
@@ -413,7 +456,7 @@ class DYKPipeline:
         for variation, result in zip(all_variations, eval_results):
             if isinstance(result, Exception):
                 self.stats["evaluation_failures"] += 1
-                print(f"Evaluation failed: {str(result)[:100]}")
+                logger.error("Evaluation failed: %s", str(result)[:100])
                 variation["evaluation"] = {"status": "failed", "error": str(result)}
             elif isinstance(result, dict) and "criteria" in result:
                 self.stats["evaluation_successes"] += 1
@@ -508,17 +551,45 @@ class DYKPipeline:
             "insights": evaluated_insights,
         }
 
-        # Save JSON
+        # Save JSON and CSV in worker threads (both writes run concurrently,
+        # off the event loop)
         json_file = output_path / f"pipeline_{self.market}_{timestamp}.json"
-        with open(json_file, "w", encoding="utf-8") as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        csv_file = output_path / f"pipeline_{self.market}_{timestamp}.csv"
+        await asyncio.gather(
+            asyncio.to_thread(dump_json, json_file, output_data),
+            asyncio.to_thread(self._export_to_csv, csv_file, evaluated_insights),
+        )
         print(f"✓ Saved JSON: {json_file}")
+        print(f"✓ Saved CSV: {csv_file}\n")
 
-        # Save CSV
-        import csv
+        # ========================================
+        # STEP 7: Summary
+        # ========================================
+        pipeline_duration = time.monotonic() - pipeline_start
+        self.stats["total_time"] = pipeline_duration
 
-        csv_file = output_path / f"pipeline_{self.market}_{timestamp}.csv"
+        print("=" * 80)
+        print("PIPELINE COMPLETE")
+        print("=" * 80)
+        print(f"Total time: {pipeline_duration:.1f}s")
+        print(f"  - Generation: {self.stats['generation_time']:.1f}s")
+        print(f"  - Deduplication: {self.stats['deduplication_time']:.1f}s")
+        print(f"  - Creative: {self.stats['creative_time']:.1f}s")
+        print(f"  - Evaluation: {self.stats['evaluation_time']:.1f}s")
+        print("\nFlow:")
+        print(f"  - Generated: {self.stats['total_insights_generated']} insights")
+        print(
+            f"  - After dedup: {self.stats['unique_insights_after_dedup']} unique insights"
+        )
+        print(f"  - Created: {self.stats['total_variations_created']} variations")
+        print(f"  - Evaluated: {self.stats['final_insights']} final insights")
+        print("=" * 80 + "\n")
 
+        return evaluated_insights
+
+    @staticmethod
+    def _export_to_csv(csv_file: Path, evaluated_insights: List[Dict[str, Any]]):
+        """Write evaluated insights (one row per variation) to CSV."""
         with open(csv_file, "w", encoding="utf-8", newline="") as f:
             writer = csv.writer(f)
 
@@ -594,33 +665,6 @@ class DYKPipeline:
                 ]
                 writer.writerow(row)
 
-        print(f"✓ Saved CSV: {csv_file}\n")
-
-        # ========================================
-        # STEP 7: Summary
-        # ========================================
-        pipeline_duration = time.time() - pipeline_start
-        self.stats["total_time"] = pipeline_duration
-
-        print("=" * 80)
-        print("PIPELINE COMPLETE")
-        print("=" * 80)
-        print(f"Total time: {pipeline_duration:.1f}s")
-        print(f"  - Generation: {self.stats['generation_time']:.1f}s")
-        print(f"  - Deduplication: {self.stats['deduplication_time']:.1f}s")
-        print(f"  - Creative: {self.stats['creative_time']:.1f}s")
-        print(f"  - Evaluation: {self.stats['evaluation_time']:.1f}s")
-        print("\nFlow:")
-        print(f"  - Generated: {self.stats['total_insights_generated']} insights")
-        print(
-            f"  - After dedup: {self.stats['unique_insights_after_dedup']} unique insights"
-        )
-        print(f"  - Created: {self.stats['total_variations_created']} variations")
-        print(f"  - Evaluated: {self.stats['final_insights']} final insights")
-        print("=" * 80 + "\n")
-
-        return evaluated_insights
-
 
 async def main():
     """CLI entry point."""
@@ -646,6 +690,17 @@ async def main():
     parser.add_argument("--output-dir", type=str, default="output")
     parser.add_argument("--requests-per-minute", type=int, default=60)
     parser.add_argument("--requests-per-second", type=int, default=10)
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Directory for the LLM response cache (omit to disable caching)",
+    )
+    parser.add_argument(
+        "--force-cache",
+        action="store_true",
+        help="Cache responses even when temperature > 0",
+    )
 
     args = parser.parse_args()
 
@@ -659,6 +714,8 @@ async def main():
         max_concurrent_evaluations=args.max_concurrent_evaluations,
         requests_per_minute=args.requests_per_minute,
         requests_per_second=args.requests_per_second,
+        cache_dir=args.cache_dir,
+        force_cache=args.force_cache,
     )
 
     insights = await pipeline.run_async(
@@ -673,4 +730,8 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    listener = start_queue_logging()
+    try:
+        run(main())
+    finally:
+        listener.stop()
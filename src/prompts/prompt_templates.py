@@ -3,7 +3,10 @@ Prompt Templates for DYK Insight Generation
 Supports multiple generation strategies and sources.
 """
 
-from typing import Dict, Any, List, Optional
+import hashlib
+import json
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 import sys
 from textwrap import dedent
@@ -14,9 +17,482 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from src.utils.config_loader import ConfigLoader
 
 
+# Generation prompt: static instructions first (identical for every call in a
+# market), cohort/template specifics last.
+_GENERATION_PREFIX = dedent("""
+    You are a medical and public health expert generating evidence-based health insights for a health application.
+
+    REGION: {market_title}
+
+    EXAMPLE HEALTH DOMAINS: {domain_names}
+    Note: You may select different health domains if more relevant
+
+    AUTHORITATIVE SOURCES FOR {market_upper}: {sources}
+
+    STRUCTURAL REQUIREMENTS:
+    1. Opening Hook (15-25 words): Lead with a surprising, specific statistic or fact
+    2. Explanation (20-40 words): Brief mechanism or context explaining why this matters
+    3. Call-to-Action (15-25 words): Clear, specific action they can take
+
+    CONTENT REQUIREMENTS:
+    - Evidence-based with specific percentages/numbers when available
+    - Relevant to the cohort's demographic, goals, lifestyle and health risks
+    - Scientifically accurate - all statistics must be verifiable
+    - Culturally appropriate for {market}
+    - Each insight must be UNIQUE (different facts, statistics, actions, health domains)
+    - Follow the conceptual intent of the selected insight template
+    - Ensure the action is practical, achievable, region-appropriate and cohort-specific
+
+    CRITICAL REQUIREMENTS:
+    - All statistics MUST be accurate and verifiable from reputable sources
+    - If uncertain about a specific number, do not include it
+    - Do not extrapolate or combine statistics in misleading ways
+    - Sources must be real organizations or publications
+    - Refer to the cohort naturally without explicitly stating age ranges
+
+    OUTPUT FORMAT (JSON):
+    {{
+    "insights": [
+        {{
+        "hook": "A compelling, attention-grabbing fact that starts with 'Did you know...' (15-25 words)",
+        "explanation": "Evidence-based explanation of why this matters for this cohort (20-40 words))",
+        "action": "A specific, actionable step the user can take (15-25 words)",
+        "source_name": "Name of the authoritative source (e.g., WHO, CDC, HPB, peer-reviewed journal)",
+        "source_url": "URL to the specific source page if available, or null for well-established medical consensus",
+        "numeric_claim": "The exact numeric claim from hook/explanation (e.g., '30%', '3x higher'), or null if no specific number"
+        }}
+        // ... repeat for every requested insight
+    ]
+    }}
+
+    AVOID:
+    - Excessive program mentions or promotional language
+    - Repeating the same insight with minor variations
+    - Multiple CTAs in one insight (focus on ONE clear action)
+    - Generic "talk to your doctor" endings without specifics
+    - Heavy-handed booking/registration CTAs in every insight
+    - Made-up or unverifiable statistics
+    - Fear-mongering language
+    - Overly explicit age range references (say "young adults" instead of "18-29 year olds")
+""").strip()
+
+_GENERATION_SUFFIX = dedent("""
+    TARGET COHORT: {cohort_description}
+    Cohort Parameters: {cohort_dimensions}
+
+    INSIGHT TEMPLATE SELECTED:
+    - Type: {template_type}
+    - Description: {template_description}
+    - Required Tone: "{template_tone}"
+    - Example Pattern: "{template_example}"
+
+    TASK:
+    Generate {num_insights} distinct "Did You Know" health insights tailored to this cohort profile, following the conceptual intent of the selected template ("{template_description}").
+
+    Return ONLY valid JSON, no additional text, markdown, or code blocks.
+""").strip()
+
+# Multi-template variant: one call covers several templates for a cohort
+_MULTI_GENERATION_SUFFIX = dedent("""
+    TARGET COHORT: {cohort_description}
+    Cohort Parameters: {cohort_dimensions}
+
+    INSIGHT TEMPLATES SELECTED (JSON list; use each "id" as template_id):
+    {templates}
+
+    TASK:
+    For EACH template above, generate {num_insights} distinct "Did You Know" health insights tailored to this cohort profile, following the conceptual intent, tone and example pattern of that template. Insights must be unique across all templates.
+
+    OUTPUT FORMAT OVERRIDE: group the insights by template instead of returning a single "insights" list:
+    {{
+    "results": [
+        {{
+        "template_id": "id of the template",
+        "insights": [ /* {num_insights} insight objects in the OUTPUT FORMAT above */ ]
+        }}
+        // ... one entry per template
+    ]
+    }}
+
+    Return ONLY valid JSON, no additional text, markdown, or code blocks.
+""").strip()
+
+
+@lru_cache(maxsize=16)
+def _generation_prefix(domain_names: str, sources: str, market: str) -> str:
+    """Render the static generation prefix (cached per market/config)."""
+    return _GENERATION_PREFIX.format(
+        market=market,
+        market_title=market.title(),
+        market_upper=market.upper(),
+        domain_names=domain_names,
+        sources=sources,
+    )
+
+
+# Placeholders left in a compiled generation suffix; NUL never occurs in
+# config text, so splitting on them is unambiguous
+_COHORT_DESCRIPTION_SLOT = "\x00COHORT_DESCRIPTION\x00"
+_COHORT_DIMENSIONS_SLOT = "\x00COHORT_DIMENSIONS\x00"
+
+# Compiled (template, num_insights) suffixes kept per PromptTemplates
+_COMPILED_CACHE_SIZE = 64
+
+
+class CompiledGenerationPrompt:
+    """
+    Generation prompt with everything but the cohort already rendered.
+
+    Built by PromptTemplates.compile(); rendering for a cohort is a single
+    join of the pre-rendered pieces and the cohort's description/dimensions.
+    """
+
+    def __init__(self, prefix: str, suffix_template: str):
+        self.prefix = prefix
+        head, rest = suffix_template.split(_COHORT_DESCRIPTION_SLOT)
+        middle, tail = rest.split(_COHORT_DIMENSIONS_SLOT)
+        self._pieces = (head, middle, tail)
+
+    def suffix(self, cohort: dict) -> str:
+        """Render the cohort-specific suffix."""
+        head, middle, tail = self._pieces
+        return "".join(
+            (head, cohort["description"], middle, str(cohort["dimensions"]), tail)
+        )
+
+    def prompt(self, cohort: dict) -> str:
+        """Full prompt text, as PromptTemplates.generation_prompt() returns."""
+        return self.prefix + "\n\n" + self.suffix(cohort)
+
+    def messages(self, cohort: dict) -> List[Dict[str, Any]]:
+        """Chat messages, as PromptTemplates.generation_messages() returns."""
+        return PromptTemplates._cacheable_messages(self.prefix, self.suffix(cohort))
+
+
+def _canonical_json(value: Any) -> str:
+    """Serialize value to a byte-stable JSON string (sorted keys, compact)."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+# Evaluation rubric is dedented once at import; per-call rendering is a
+# single str.format() pass over the pre-built template.
+_VALIDATION_PROMPT = dedent("""
+    You are a rigorous evaluator for health insights. Your role is to catch errors, hallucinations, and quality issues before insights reach end users.
+
+    INSIGHT TO EVALUATE:
+    "{insight_text}"
+    
+    EVIDENCE PROVIDED:
+    {evidence_section}
+    
+    CONTEXT:
+    - Target Cohort: {cohort_name} - {cohort_description}
+    - Cohort Dimensions: {cohort_dimensions}
+    - Market: {market_title}
+    - Template Type: {template_type} - {template_description}
+    
+    EVALUATION TASK:
+    Rate the insight on 6 criteria using a 1-10 scale where:
+    - 1-3: Critical issues, should not be published
+    - 4-6: Significant problems, needs major revision
+    - 7-8: Minor issues, needs small improvements
+    - 9-10: Excellent, ready to publish
+
+    For each criterion, provide:
+    1. Integer score (1-10)
+    2. Concise justification (2-3 sentences max)
+    3. Specific issues found (empty list if none)
+
+    ---
+
+    CRITERION 1: FACTUAL ACCURACY
+    Does this insight contain accurate, verifiable health information?
+
+    ✓ PASS if:
+    - All statistics/numbers are plausible and verifiable
+    - Health claims align with mainstream medical consensus
+    - No exaggerated or misleading statements
+    - Percentages, timeframes, and quantities are reasonable
+
+    ✗ FAIL if:
+    - Contains obviously wrong numbers (e.g., "walking reduces heart disease by 200%")
+    - Makes implausible claims (e.g., "cures cancer in 3 days")
+    - Contradicts established medical knowledge
+    - Includes made-up statistics or sources
+
+    SPECIFIC CHECKS:
+    - Are the numbers (percentages, durations, quantities) realistic?
+    - Can the claim be verified or is it plausible given the source?
+    - Does it avoid absolute claims like "always", "never", "guarantees"?
+
+    ---
+
+    CRITERION 2: SAFETY
+    Is this insight safe for end users without risk of harm?
+
+    ✓ PASS if:
+    - Appropriate for general audience
+    - No dangerous medical advice
+    - Doesn't encourage harmful behaviors
+    - Suitable for the target cohort (including vulnerable groups)
+
+    ✗ FAIL if:
+    - Recommends stopping prescribed medications
+    - Encourages dangerous activities without caveats
+    - Contains triggering content for health conditions
+    - Gives medical diagnoses or treatment advice
+    - Promotes extreme diets, over-exercise, or self-harm
+
+    SPECIFIC CHECKS:
+    - Could this advice harm someone if followed?
+    - Does it suggest consulting a doctor when appropriate?
+    - Is it appropriate for all members of the target cohort?
+
+    ---
+
+    CRITERION 3: FAITHFULNESS TO EVIDENCE
+    Does the insight accurately represent its source material?
+
+    ✓ PASS if:
+    - Claims are supported by the cited source (or are plausibly from such sources)
+    - No cherry-picking or misrepresentation
+    - Appropriate confidence level (doesn't overstate findings)
+    - Clearly distinguishes correlation from causation
+
+    ✗ FAIL if:
+    - Makes claims unsupported by source type (e.g., citing "Harvard study" for obvious falsehoods)
+    - Exaggerates findings (study shows "may help" → insight claims "proven to cure")
+    - Misattributes information to reputable sources
+    - Extrapolates beyond reasonable interpretation
+
+    SPECIFIC CHECKS:
+    - Given the source name/type, is this claim plausible?
+    - Does it avoid overstating certainty ("research shows" vs "one study suggests")?
+    - If no source provided, is it common health knowledge?
+
+    ---
+
+    CRITERION 4: COHORT RELEVANCE
+    Is this insight valuable and relatable for "{cohort_name}"?
+
+    ✓ PASS if:
+    - Addresses specific needs/challenges of this cohort
+    - Uses language and examples they relate to
+    - Timing/lifecycle stage matches (e.g., retirement tips for retirees, not students)
+    - Acknowledges their constraints (time, mobility, resources)
+
+    ✗ FAIL if:
+    - Generic advice that applies to everyone
+    - Ignores cohort's lifestyle or limitations (e.g., "exercise 2 hours daily" for busy parents)
+    - Assumes resources they may not have
+    - Uses tone/language mismatched to demographic
+
+    SPECIFIC CHECKS:
+    - Does it reference the cohort's lifestyle, goals, or pain points?
+    - Would this cohort think "this is for me" or "this is generic"?
+    - Are examples and context appropriate for their life stage?
+
+    COHORT DETAILS TO CONSIDER: {cohort_description}
+
+    ---
+
+    CRITERION 5: ACTIONABILITY
+    Is the suggested action clear, practical, and achievable for this cohort in {market_title}?
+
+    ✓ PASS if:
+    - Action is specific and concrete (not "be healthier")
+    - Realistic for the cohort's lifestyle and constraints
+    - Measurable or observable (can tell if they did it)
+    - Accessible in the target market (no location-specific barriers)
+    - Free from commercial promotions or product placement
+
+    ✗ FAIL if:
+    - Vague advice ("improve your health", "try to be active")
+    - Unrealistic time/cost commitment for cohort
+    - Requires unavailable resources in target market
+    - Promotes specific brands or paid services
+    - Too many actions at once (overwhelming)
+
+    SPECIFIC CHECKS:
+    - Can someone do this tomorrow? This week?
+    - Is it clear what success looks like?
+    - Does it avoid promoting products/services/apps?
+    - Is it appropriate for {market_title} (access, legality, culture)?
+
+    ---
+
+    CRITERION 6: LOCALIZATION
+    Is this insight grounded in {market_title} culture, context, and lifestyle?
+
+    ✓ PASS if:
+    - Uses local terminology, food, places naturally (not forced)
+    - References culturally appropriate activities/contexts
+    - Considers local climate, urban design, work culture
+    - Measurements and units match regional standards
+    - Language feels native, not translated
+
+    ✗ FAIL if:
+    - Generic Western examples in non-Western market, eastern examples in western market
+    - References inaccessible locations (e.g., "local park" in dense urban area with no parks)
+    - Ignores cultural norms (e.g., gym culture where gyms are rare/expensive)
+    - Forced localization that feels unnatural
+
+    SPECIFIC CHECKS FOR {market_upper}:
+    - Does it use local food, places, or cultural references where natural?
+    - Are suggestions accessible given local infrastructure?
+    - Does it respect local work culture and lifestyle patterns?
+    - Would a local resident find this relatable?
+
+    ---
+
+    FINAL SCORING:
+
+    Calculate overall_score as the average of all 6 criteria:
+    overall_score = (factual_accuracy + safety + faithfulness + cohort_relevance + actionability + localization) / 6
+
+    Set pass = true ONLY if ALL of these conditions are met:
+    - All 6 criteria scores ≥ 7
+    - factual_accuracy ≥ 8 (critical)
+    - safety ≥ 8 (critical)
+
+    Otherwise, set pass = false.
+
+    OUTPUT FORMAT (JSON only, no markdown):
+    {{
+        "criteria": {{
+            "factual_accuracy": {{"score": 8, "justification": "...", "issues": []}},
+            "safety": {{"score": 9, "justification": "...", "issues": []}},
+            "faithfulness": {{"score": 7, "justification": "...", "issues": []}},
+            "cohort_relevance": {{"score": 8, "justification": "...", "issues": []}},
+            "actionability": {{"score": 7, "justification": "...", "issues": []}},
+            "localization": {{"score": 6, "justification": "...", "issues": ["..."]}},
+        }},
+        "overall_score": 7.5,
+        "pass": false,
+        "strengths": ["Strength 1", "Strength 2"],
+        "critical_issues": ["Critical issue that blocks publication"],
+        "recommendations": ["Specific recommendation 1", "Specific recommendation 2"]
+    }}
+
+    Return ONLY valid JSON. No markdown, no code blocks, no additional text.
+""").strip()
+
+
 class PromptTemplates:
     """Collection of prompt templates for different generation modes."""
 
+    def __init__(self):
+        # (health_domains, sources, market, prefix) of the last static prefix
+        self._static = None
+        # (id(insight_template), num_insights) -> (insight_template, compiled)
+        self._compiled = {}
+
+    def prepare_static(
+        self, health_domains: dict, sources: dict, market: str = "singapore"
+    ) -> str:
+        """
+        Render the static generation prefix for a run's config.
+
+        health_domains and sources are serialized to canonical JSON once and
+        reused while the same objects are passed in, so every prompt in a run
+        shares a byte-identical prefix.
+        """
+        static = self._static
+        if (
+            static is not None
+            and static[0] is health_domains
+            and static[1] is sources
+            and static[2] == market
+        ):
+            return static[3]
+
+        prefix = _generation_prefix(
+            _canonical_json(list(health_domains.keys())),
+            _canonical_json(sources),
+            market,
+        )
+        # Holding the objects keeps their identity from being reused
+        self._static = (health_domains, sources, market, prefix)
+        return prefix
+
+    def compile(
+        self,
+        insight_template: dict,
+        health_domains: dict,
+        sources: dict,
+        market: str = "singapore",
+        num_insights: int = 20,
+    ) -> CompiledGenerationPrompt:
+        """
+        Pre-render the generation prompt for one template, leaving only the
+        cohort to fill in.
+
+        Use when the same template is rendered for many cohorts:
+        compiled.messages(cohort) / compiled.prompt(cohort).
+        """
+        prefix = self.prepare_static(health_domains, sources, market)
+        suffix_template = _GENERATION_SUFFIX.format(
+            cohort_description=_COHORT_DESCRIPTION_SLOT,
+            cohort_dimensions=_COHORT_DIMENSIONS_SLOT,
+            template_type=insight_template["type"],
+            template_description=insight_template["description"],
+            template_tone=insight_template["tone"],
+            template_example=insight_template["example"],
+            num_insights=num_insights,
+        )
+        return CompiledGenerationPrompt(prefix, suffix_template)
+
+    def _compiled_for(
+        self,
+        insight_template: dict,
+        health_domains: dict,
+        sources: dict,
+        market: str,
+        num_insights: int,
+    ) -> CompiledGenerationPrompt:
+        """compile() result for this template, reused across cohorts."""
+        prefix = self.prepare_static(health_domains, sources, market)
+        key = (id(insight_template), num_insights)
+        entry = self._compiled.get(key)
+        # The held template guards against id reuse; a changed static prefix
+        # (new config/market) invalidates the entry
+        if (
+            entry is not None
+            and entry[0] is insight_template
+            and entry[1].prefix is prefix
+        ):
+            return entry[1]
+
+        if len(self._compiled) >= _COMPILED_CACHE_SIZE:
+            self._compiled.clear()
+        compiled = self.compile(
+            insight_template, health_domains, sources, market, num_insights
+        )
+        self._compiled[key] = (insight_template, compiled)
+        return compiled
+
+    def build_cag_block(
+        self, sources: dict, health_domains: dict, market: str = "singapore"
+    ) -> Tuple[str, str]:
+        """
+        Static knowledge block shared by every generation call, and its hash.
+
+        Returns:
+            (block_text, content_hash) - the hash changes whenever sources,
+            health domains or market change, so callers can tell when a
+            provider-side cached prefix must be re-warmed.
+        """
+        block = self.prepare_static(health_domains, sources, market)
+        content_hash = hashlib.sha256(block.encode("utf-8")).hexdigest()[:16]
+        return block, content_hash
+
+    def cache_warmup_messages(
+        self, sources: dict, health_domains: dict, market: str = "singapore"
+    ) -> List[Dict[str, Any]]:
+        """Minimal request whose cache-marked system block matches generation calls."""
+        block, _ = self.build_cag_block(sources, health_domains, market)
+        return self._cacheable_messages(block, "Reply with OK.")
+
     def generation_prompt(
         self,
         cohort: dict,
@@ -29,80 +505,102 @@ class PromptTemplates:
         """
         Generate prompt for pure LLM-based insight generation (no external tools).
         Uses LLM's pre-trained knowledge only.
+
+        The prompt is a static prefix shared by every cohort/template call for a
+        market, followed by a short cohort/template-specific suffix.
         """
-        prompt = dedent(f"""
-        
-        You are a medical and public health expert generating evidence-based health insights for a health application.
-
-        REGION: {market.title()}
-
-        TARGET COHORT: {cohort["description"]}
-        Cohort Parameters: {cohort["dimensions"]}
-
-        INSIGHT TEMPLATE SELECTED:
-        - Type: {insight_template["type"]}
-        - Description: {insight_template["description"]}
-        - Required Tone: "{insight_template["tone"]}"
-        - Example Pattern: "{insight_template["example"]}"
-
-        EXAMPLE HEALTH DOMAINS: {list(health_domains.keys())}
-        Note: You may select different health domains if more relevant
-
-        AUTHORITATIVE SOURCES FOR {market.upper()}: {sources}
-
-        TASK:
-        Generate {num_insights} distinct "Did You Know" health insights tailored to this cohort profile.
-        
-        STRUCTURAL REQUIREMENTS:
-        1. Opening Hook (15-25 words): Lead with a surprising, specific statistic or fact
-        2. Explanation (20-40 words): Brief mechanism or context explaining why this matters
-        3. Call-to-Action (15-25 words): Clear, specific action they can take
-        
-        CONTENT REQUIREMENTS:
-        - Evidence-based with specific percentages/numbers when available
-        - Relevant to the cohort's demographic, goals, lifestyle and health risks
-        - Scientifically accurate - all statistics must be verifiable
-        - Culturally appropriate for {market}
-        - Each insight must be UNIQUE (different facts, statistics, actions, health domains)
-        - Follow the conceptual intent of the selected template ("{insight_template["description"]}")
-        - Ensure the action is practical, achievable, region-appropriate and cohort-specific
-        
-        CRITICAL REQUIREMENTS:
-        - All statistics MUST be accurate and verifiable from reputable sources
-        - If uncertain about a specific number, do not include it
-        - Do not extrapolate or combine statistics in misleading ways
-        - Sources must be real organizations or publications
-        - Refer to the cohort naturally without explicitly stating age ranges
-        
-        OUTPUT FORMAT (JSON):
-        {{
-        "insights": [
-            {{
-            "hook": "A compelling, attention-grabbing fact that starts with 'Did you know...' (15-25 words)",
-            "explanation": "Evidence-based explanation of why this matters for this cohort (20-40 words))",
-            "action": "A specific, actionable step the user can take (15-25 words)",
-            "source_name": "Name of the authoritative source (e.g., WHO, CDC, HPB, peer-reviewed journal)",
-            "source_url": "URL to the specific source page if available, or null for well-established medical consensus",
-            "numeric_claim": "The exact numeric claim from hook/explanation (e.g., '30%', '3x higher'), or null if no specific number"
-            }}
-            // ... repeat for all {num_insights} insights
-        ]
-        }}
+        prefix, suffix = self._generation_parts(
+            cohort, insight_template, health_domains, sources, market, num_insights
+        )
+        return prefix + "\n\n" + suffix
 
-        AVOID:
-        - Excessive program mentions or promotional language
-        - Repeating the same insight with minor variations
-        - Multiple CTAs in one insight (focus on ONE clear action)
-        - Generic "talk to your doctor" endings without specifics
-        - Heavy-handed booking/registration CTAs in every insight
-        - Made-up or unverifiable statistics
-        - Fear-mongering language
-        - Overly explicit age range references (say "young adults" instead of "18-29 year olds")
-
-        Return ONLY valid JSON, no additional text, markdown, or code blocks.
-        """).strip()
+    def generation_messages(
+        self,
+        cohort: dict,
+        insight_template: dict,
+        health_domains: dict,
+        sources: dict,
+        market: str = "singapore",
+        num_insights: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """
+        Same prompt as generation_prompt(), as chat messages for provider-side
+        prompt caching.
 
-        return prompt
+        The static prefix goes in a system message marked with cache_control so
+        it is cached across cohort/template calls; the cohort/template suffix is
+        the user message.
+        """
+        prefix, suffix = self._generation_parts(
+            cohort, insight_template, health_domains, sources, market, num_insights
+        )
+        return self._cacheable_messages(prefix, suffix)
+
+    def multi_generation_messages(
+        self,
+        cohort: dict,
+        insight_templates: List[dict],
+        health_domains: dict,
+        sources: dict,
+        market: str = "singapore",
+        num_insights: int = 5,
+    ) -> List[Dict[str, Any]]:
+        """
+        Chat messages asking for insights for several templates in one call.
+
+        Shares the static system prefix with generation_messages(); the
+        response groups insights per template under "results", keyed by each
+        template's type as template_id.
+        """
+        prefix = self.prepare_static(health_domains, sources, market)
+        templates = [
+            {
+                "id": t["type"],
+                "description": t["description"],
+                "tone": t["tone"],
+                "example": t["example"],
+            }
+            for t in insight_templates
+        ]
+        suffix = _MULTI_GENERATION_SUFFIX.format(
+            cohort_description=cohort["description"],
+            cohort_dimensions=cohort["dimensions"],
+            templates=_canonical_json(templates),
+            num_insights=num_insights,
+        )
+        return self._cacheable_messages(prefix, suffix)
+
+    @staticmethod
+    def _cacheable_messages(prefix: str, suffix: str) -> List[Dict[str, Any]]:
+        """System message with the cache-marked static prefix, then the user suffix."""
+        return [
+            {
+                "role": "system",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": prefix,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ],
+            },
+            {"role": "user", "content": suffix},
+        ]
+
+    def _generation_parts(
+        self,
+        cohort: dict,
+        insight_template: dict,
+        health_domains: dict,
+        sources: dict,
+        market: str,
+        num_insights: int,
+    ) -> Tuple[str, str]:
+        """Build the (static prefix, cohort/template suffix) of the generation prompt."""
+        compiled = self._compiled_for(
+            insight_template, health_domains, sources, market, num_insights
+        )
+        return compiled.prefix, compiled.suffix(cohort)
 
     def validation_prompt(
         self,
@@ -128,206 +626,17 @@ class PromptTemplates:
         else:
             evidence_section = "No specific source provided - evaluate based on general medical/health knowledge."
 
-        prompt = dedent(f"""
-            You are a rigorous evaluator for health insights. Your role is to catch errors, hallucinations, and quality issues before insights reach end users.
-
-            INSIGHT TO EVALUATE:
-            "{insight_text}"
-            
-            EVIDENCE PROVIDED:
-            {evidence_section}
-            
-            CONTEXT:
-            - Target Cohort: {cohort["name"]} - {cohort["description"]}
-            - Cohort Dimensions: {cohort["dimensions"]}
-            - Market: {market.title()}
-            - Template Type: {insight_template["type"]} - {insight_template["description"]}
-            
-            EVALUATION TASK:
-            Rate the insight on 6 criteria using a 1-10 scale where:
-            - 1-3: Critical issues, should not be published
-            - 4-6: Significant problems, needs major revision
-            - 7-8: Minor issues, needs small improvements
-            - 9-10: Excellent, ready to publish
-
-            For each criterion, provide:
-            1. Integer score (1-10)
-            2. Concise justification (2-3 sentences max)
-            3. Specific issues found (empty list if none)
-
-            ---
-
-            CRITERION 1: FACTUAL ACCURACY
-            Does this insight contain accurate, verifiable health information?
-
-            ✓ PASS if:
-            - All statistics/numbers are plausible and verifiable
-            - Health claims align with mainstream medical consensus
-            - No exaggerated or misleading statements
-            - Percentages, timeframes, and quantities are reasonable
-
-            ✗ FAIL if:
-            - Contains obviously wrong numbers (e.g., "walking reduces heart disease by 200%")
-            - Makes implausible claims (e.g., "cures cancer in 3 days")
-            - Contradicts established medical knowledge
-            - Includes made-up statistics or sources
-
-            SPECIFIC CHECKS:
-            - Are the numbers (percentages, durations, quantities) realistic?
-            - Can the claim be verified or is it plausible given the source?
-            - Does it avoid absolute claims like "always", "never", "guarantees"?
-
-            ---
-
-            CRITERION 2: SAFETY
-            Is this insight safe for end users without risk of harm?
-
-            ✓ PASS if:
-            - Appropriate for general audience
-            - No dangerous medical advice
-            - Doesn't encourage harmful behaviors
-            - Suitable for the target cohort (including vulnerable groups)
-
-            ✗ FAIL if:
-            - Recommends stopping prescribed medications
-            - Encourages dangerous activities without caveats
-            - Contains triggering content for health conditions
-            - Gives medical diagnoses or treatment advice
-            - Promotes extreme diets, over-exercise, or self-harm
-
-            SPECIFIC CHECKS:
-            - Could this advice harm someone if followed?
-            - Does it suggest consulting a doctor when appropriate?
-            - Is it appropriate for all members of the target cohort?
-
-            ---
-
-            CRITERION 3: FAITHFULNESS TO EVIDENCE
-            Does the insight accurately represent its source material?
-
-            ✓ PASS if:
-            - Claims are supported by the cited source (or are plausibly from such sources)
-            - No cherry-picking or misrepresentation
-            - Appropriate confidence level (doesn't overstate findings)
-            - Clearly distinguishes correlation from causation
-
-            ✗ FAIL if:
-            - Makes claims unsupported by source type (e.g., citing "Harvard study" for obvious falsehoods)
-            - Exaggerates findings (study shows "may help" → insight claims "proven to cure")
-            - Misattributes information to reputable sources
-            - Extrapolates beyond reasonable interpretation
-
-            SPECIFIC CHECKS:
-            - Given the source name/type, is this claim plausible?
-            - Does it avoid overstating certainty ("research shows" vs "one study suggests")?
-            - If no source provided, is it common health knowledge?
-
-            ---
-
-            CRITERION 4: COHORT RELEVANCE
-            Is this insight valuable and relatable for "{cohort["name"]}"?
-
-            ✓ PASS if:
-            - Addresses specific needs/challenges of this cohort
-            - Uses language and examples they relate to
-            - Timing/lifecycle stage matches (e.g., retirement tips for retirees, not students)
-            - Acknowledges their constraints (time, mobility, resources)
-
-            ✗ FAIL if:
-            - Generic advice that applies to everyone
-            - Ignores cohort's lifestyle or limitations (e.g., "exercise 2 hours daily" for busy parents)
-            - Assumes resources they may not have
-            - Uses tone/language mismatched to demographic
-
-            SPECIFIC CHECKS:
-            - Does it reference the cohort's lifestyle, goals, or pain points?
-            - Would this cohort think "this is for me" or "this is generic"?
-            - Are examples and context appropriate for their life stage?
-
-            COHORT DETAILS TO CONSIDER: {cohort["description"]}
-
-            ---
-
-            CRITERION 5: ACTIONABILITY
-            Is the suggested action clear, practical, and achievable for this cohort in {market.title()}?
-
-            ✓ PASS if:
-            - Action is specific and concrete (not "be healthier")
-            - Realistic for the cohort's lifestyle and constraints
-            - Measurable or observable (can tell if they did it)
-            - Accessible in the target market (no location-specific barriers)
-            - Free from commercial promotions or product placement
-
-            ✗ FAIL if:
-            - Vague advice ("improve your health", "try to be active")
-            - Unrealistic time/cost commitment for cohort
-            - Requires unavailable resources in target market
-            - Promotes specific brands or paid services
-            - Too many actions at once (overwhelming)
-
-            SPECIFIC CHECKS:
-            - Can someone do this tomorrow? This week?
-            - Is it clear what success looks like?
-            - Does it avoid promoting products/services/apps?
-            - Is it appropriate for {market.title()} (access, legality, culture)?
-
-            ---
-
-            CRITERION 6: LOCALIZATION
-            Is this insight grounded in {market.title()} culture, context, and lifestyle?
-
-            ✓ PASS if:
-            - Uses local terminology, food, places naturally (not forced)
-            - References culturally appropriate activities/contexts
-            - Considers local climate, urban design, work culture
-            - Measurements and units match regional standards
-            - Language feels native, not translated
-
-            ✗ FAIL if:
-            - Generic Western examples in non-Western market, eastern examples in western market
-            - References inaccessible locations (e.g., "local park" in dense urban area with no parks)
-            - Ignores cultural norms (e.g., gym culture where gyms are rare/expensive)
-            - Forced localization that feels unnatural
-
-            SPECIFIC CHECKS FOR {market.upper()}:
-            - Does it use local food, places, or cultural references where natural?
-            - Are suggestions accessible given local infrastructure?
-            - Does it respect local work culture and lifestyle patterns?
-            - Would a local resident find this relatable?
-
-            ---
-
-            FINAL SCORING:
-
-            Calculate overall_score as the average of all 6 criteria:
-            overall_score = (factual_accuracy + safety + faithfulness + cohort_relevance + actionability + localization) / 6
-
-            Set pass = true ONLY if ALL of these conditions are met:
-            - All 6 criteria scores ≥ 7
-            - factual_accuracy ≥ 8 (critical)
-            - safety ≥ 8 (critical)
-
-            Otherwise, set pass = false.
-
-            OUTPUT FORMAT (JSON only, no markdown):
-            {{
-                "criteria": {{
-                    "factual_accuracy": {{"score": 8, "justification": "...", "issues": []}},
-                    "safety": {{"score": 9, "justification": "...", "issues": []}},
-                    "faithfulness": {{"score": 7, "justification": "...", "issues": []}},
-                    "cohort_relevance": {{"score": 8, "justification": "...", "issues": []}},
-                    "actionability": {{"score": 7, "justification": "...", "issues": []}},
-                    "localization": {{"score": 6, "justification": "...", "issues": ["..."]}},
-                }},
-                "overall_score": 7.5,
-                "pass": false,
-                "strengths": ["Strength 1", "Strength 2"],
-                "critical_issues": ["Critical issue that blocks publication"],
-                "recommendations": ["Specific recommendation 1", "Specific recommendation 2"]
-            }}
-
-            Return ONLY valid JSON. No markdown, no code blocks, no additional text.
-        """).strip()
+        prompt = _VALIDATION_PROMPT.format(
+            insight_text=insight_text,
+            evidence_section=evidence_section,
+            cohort_name=cohort["name"],
+            cohort_description=cohort["description"],
+            cohort_dimensions=cohort["dimensions"],
+            market_title=market.title(),
+            market_upper=market.upper(),
+            template_type=insight_template["type"],
+            template_description=insight_template["description"],
+        )
 
         return prompt
 
@@ -2,6 +2,7 @@
 
 import yaml
 from pathlib import Path
+from urllib.parse import urlsplit
 from typing import Dict, Any, Optional
 
 
@@ -42,6 +43,17 @@ class ConfigLoader:
             for tier, info in self.sources.items()
         }
 
+    @property
+    def source_domains(self):
+        """Domains of the configured evidence sources ("www." dropped)."""
+        domains = set()
+        for info in self.sources.values():
+            for src in info["sources"]:
+                host = (urlsplit(src.get("url", "")).hostname or "").lower()
+                if host:
+                    domains.add(host[4:] if host.startswith("www.") else host)
+        return domains
+
     @property
     def cohort_definitions(self):
         return self.load_yaml(self.market_path / "cohort_definitions.yaml")[
@@ -0,0 +1,22 @@
+"""Event loop selection for CLI entry points."""
+
+import asyncio
+from typing import Any, Coroutine
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def run(main: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine to completion, on uvloop when it is installed.
+
+    Falls back to asyncio.run() (stock event loop) otherwise, e.g. on Windows.
+    """
+    if uvloop is None:
+        return asyncio.run(main)
+
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(main)
@@ -0,0 +1,238 @@
+"""
+Shared JSON helpers: parsing and repair of JSON returned by LLM calls, and
+fast writing of output files (orjson when installed).
+"""
+
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# Markdown code fence around LLM JSON output; group 1 is the payload
+_FENCE_RE = re.compile(r"\A\s*```(?:json)?\s*(.*?)\s*```\s*\Z", re.DOTALL)
+_OPEN_FENCE_RE = re.compile(r"\A\s*```(?:json)?")
+
+# JSON repair patterns (applied only after a parse failure)
+# Last character of any repairable response (closing brace/bracket, end of a
+# string or number)
+_JSON_END_CHARS = frozenset('}]"0123456789')
+_MAX_REPAIR_PASSES = 4
+# Both are matched only at the decoder's error position, which lies outside
+# any string literal, so text inside string values is never rewritten
+_TRAILING_COMMA_RE = re.compile(r",\s*[}\]]")
+# }"key", ]"key" or "value" "key" with only whitespace between
+_MISSING_COMMA_RE = re.compile(r'(?<=[\]}"])\s*"')
+
+
+def parse_json_response(response: str, source: str = "LLM") -> Any:
+    """
+    Parse JSON from an LLM response with automatic repair for common issues.
+
+    Args:
+        response: Raw LLM output, optionally wrapped in a markdown code fence
+        source: Component name used in log messages
+
+    Returns:
+        Parsed JSON value
+
+    Raises:
+        json.JSONDecodeError: If the response is truncated or cannot be repaired
+    """
+    # Remove markdown code blocks (common LLM behavior)
+    match = _FENCE_RE.match(response)
+    if match:
+        response = match.group(1)
+    else:
+        # No closing fence (e.g. output cut off) - drop an opening one only
+        response = _OPEN_FENCE_RE.sub("", response).strip()
+
+    # Try parsing original response (fast path)
+    try:
+        return _loads(response)
+    except ValueError:
+        pass
+
+    # Output cut off mid-value (e.g. max_tokens reached) cannot be repaired;
+    # fail fast instead of running the repair passes
+    if not response or response[-1] not in _JSON_END_CHARS:
+        logger.error(
+            "Truncated JSON response (%s): %d chars, ends with %r",
+            source,
+            len(response),
+            response[-40:],
+        )
+        raise json.JSONDecodeError(
+            "Response appears truncated", response, len(response)
+        )
+
+    # Re-parse with stdlib json: the repair heuristics rely on its error messages
+    try:
+        return json.loads(response)
+    except json.JSONDecodeError as e:
+        # Attempt automatic repairs for common LLM JSON errors. Repairs are
+        # re-applied to the result, since one response can have several
+        # issues (e.g. a trailing comma and a missing closing brace).
+        candidate, error = response, e
+        for _ in range(_MAX_REPAIR_PASSES):
+            repaired = attempt_json_repair(candidate, error)
+            if not repaired:
+                break  # No rule matches, fall through to error logging
+            try:
+                parsed = json.loads(repaired)
+            except json.JSONDecodeError as next_error:
+                candidate, error = repaired, next_error
+            else:
+                logger.warning(
+                    "Auto-repaired JSON (%s): %s at position %d",
+                    source,
+                    e.msg,
+                    e.pos,
+                )
+                return parsed
+
+        # Repair failed or not attempted - log error, dump context at DEBUG only
+        logger.error(
+            "JSON parse error (%s): %s at line=%d col=%d pos=%d",
+            source,
+            e.msg,
+            e.lineno,
+            e.colno,
+            e.pos,
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Context around error:\n%s\nFull response:\n%s",
+                response[max(0, e.pos - 150) : e.pos + 150],
+                response,
+            )
+
+        raise
+
+
+def attempt_json_repair(response: str, error: json.JSONDecodeError) -> Optional[str]:
+    """
+    Attempt to repair common JSON formatting issues from LLM responses.
+
+    Common issues fixed:
+    1. Missing commas between object properties
+    2. Trailing commas before closing braces/brackets
+    3. Missing closing brackets/braces
+
+    Args:
+        response: The malformed JSON string
+        error: The JSONDecodeError with position information
+
+    Returns:
+        Repaired JSON string if repair was attempted, None otherwise
+    """
+
+    # Only attempt repair for specific, fixable errors
+    error_msg = error.msg.lower()
+
+    # Fix 1 & 2: Missing commas between values, trailing commas before
+    # a closing brace/bracket
+    if (
+        "expecting ',' delimiter" in error_msg
+        or "expecting property name" in error_msg
+    ):
+        # End of the last token before the error (the decoder skips
+        # whitespace before reporting)
+        end = len(response[: error.pos].rstrip())
+        if end and _TRAILING_COMMA_RE.match(response, end - 1):
+            return response[: end - 1] + response[end:]
+        if _MISSING_COMMA_RE.match(response, end):
+            return response[:end] + "," + response[end:]
+
+    # Fix 3: Missing closing braces/brackets (simple heuristic)
+    if "expecting" in error_msg and error.pos >= len(response) - 5:
+        # Count opening and closing braces
+        open_braces = response.count("{")
+        close_braces = response.count("}")
+        open_brackets = response.count("[")
+        close_brackets = response.count("]")
+
+        # Add missing closing characters
+        missing = ""
+        if close_brackets < open_brackets:
+            missing += "]" * (open_brackets - close_brackets)
+        if close_braces < open_braces:
+            missing += "}" * (open_braces - close_braces)
+
+        if missing:
+            return response + missing
+
+    # No repair attempted
+    return None
+
+
+def _dumps_indented(data: Any) -> bytes:
+    """Serialize data as UTF-8 JSON indented by two spaces per level."""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def dump_json(path: Union[str, Path], data: Any):
+    """Write data to path as indented UTF-8 JSON."""
+    Path(path).write_bytes(_dumps_indented(data))
+
+
+def encode_record(record: Any) -> bytes:
+    """
+    Serialize one record for dump_json_records().
+
+    The result is indented as an item of the records array, so the same
+    bytes can be written to several files without re-serializing.
+    """
+    # JSON strings cannot contain a raw newline, so every newline is layout
+    return b"    " + _dumps_indented(record).replace(b"\n", b"\n    ")
+
+
+def dump_json_records(
+    path: Union[str, Path],
+    header: Dict[str, Any],
+    records: Iterable[bytes],
+    key: str = "insights",
+):
+    """
+    Write {**header, key: [records...]} to path, one record at a time.
+
+    The output is byte-for-byte what dump_json() writes for the assembled
+    dict, but the whole document is never held in memory at once.
+
+    Args:
+        path: Output file
+        header: Non-empty top-level fields written before the records
+        records: Records encoded with encode_record(), in output order
+        key: Name of the records array
+    """
+    head = _dumps_indented(header)
+    with open(path, "wb") as f:
+        # Reopen the header object: drop its closing "\n}"
+        f.write(head[:-2])
+        f.write(b",\n  " + _dumps_indented(key) + b": [")
+        separator = b"\n"
+        for encoded in records:
+            f.write(separator)
+            f.write(encoded)
+            separator = b",\n"
+        # An empty array stays "[]", as the serializers write it
+        f.write(b"]\n}" if separator == b"\n" else b"\n  ]\n}")
+
+
+def dumps_line(record: Any) -> bytes:
+    """Serialize one record as an NDJSON line (UTF-8 bytes)."""
+    if orjson:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
@@ -0,0 +1,33 @@
+"""Logging configuration for CLI entry points."""
+
+import logging
+import logging.handlers
+import queue
+
+
+def start_queue_logging(level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """
+    Route root logging through a queue drained by a background thread.
+
+    Records are enqueued by a QueueHandler, so callers on the event loop never
+    block on stream writes; a QueueListener thread formats and writes them.
+
+    Args:
+        level: Root logger level
+
+    Returns:
+        The started listener; call stop() on exit to flush pending records
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
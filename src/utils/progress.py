@@ -0,0 +1,43 @@
+"""Throttled progress reporting for long async fan-outs."""
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    """
+    Logs "label: done/total (rate/s)" at most once per interval.
+
+    Call update() as each task completes (e.g. while iterating
+    asyncio.as_completed); the final completion is always reported.
+    """
+
+    def __init__(self, label: str, total: int, interval: float = 1.0):
+        """
+        Initialize the reporter.
+
+        Args:
+            label: Prefix for each progress line
+            total: Number of tasks expected to complete
+            interval: Minimum seconds between progress lines
+        """
+        self.label = label
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self._start = time.monotonic()
+        self._last_report = self._start
+
+    def update(self, n: int = 1):
+        """Record n completions and log progress if the interval has passed."""
+        self.done += n
+        now = time.monotonic()
+        if now - self._last_report < self.interval and self.done < self.total:
+            return
+
+        self._last_report = now
+        elapsed = now - self._start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        logger.info("%s: %d/%d (%.1f/s)", self.label, self.done, self.total, rate)
@@ -0,0 +1,97 @@
+"""On-disk cache for parsed LLM responses."""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+class ResponseCache:
+    """
+    Exact-match cache of parsed LLM responses stored as JSON files.
+
+    Entries are sharded by the first two hex characters of the key:
+    <cache_dir>/<key[:2]>/<key>.json
+    """
+
+    def __init__(self, cache_dir: Path):
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_dir: Directory where cache entries are stored
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        prompt: Union[str, List[Dict[str, Any]]],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> str:
+        """Build a cache key from the request parameters (prompt text or messages)."""
+        if not isinstance(prompt, str):
+            prompt = json.dumps(prompt, sort_keys=True, separators=(",", ":"))
+        raw = f"{model}|{temperature}|{max_tokens}|{prompt}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def make_fast_key(
+        prompt: Union[str, List[Dict[str, Any]]],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> str:
+        """
+        Non-cryptographic 128-bit key for in-process lookups (memory cache,
+        in-flight coalescing).
+
+        Uses xxh3_128 when xxhash is installed, else blake2b; both are much
+        cheaper than sha256 on multi-KB prompts. Keys are not stable across
+        that choice, so persistent entries keep using make_key().
+        """
+        if not isinstance(prompt, str):
+            prompt = json.dumps(prompt, sort_keys=True, separators=(",", ":"))
+        h = xxhash.xxh3_128() if xxhash else hashlib.blake2b(digest_size=16)
+        h.update(f"{model}|{temperature}|{max_tokens}|".encode("utf-8"))
+        h.update(prompt.encode("utf-8"))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store value under key (atomic replace, safe across processes)."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
@@ -0,0 +1,215 @@
+"""Smoke test for the end-to-end generate_insights pipeline."""
+
+import asyncio
+import csv
+import json
+
+import httpx
+
+import src.generate_insights as generate_insights
+from src.core.validator_async import AsyncInsightValidator
+
+INSIGHT = {
+    "hook": "Did you know a daily 30-minute walk cuts heart disease risk by 30%?",
+    "explanation": " ".join(["Regular brisk walking strengthens the heart."] * 7),
+    "action": "Walk briskly for 30 minutes after dinner each day.",
+    "source_name": "Health Promotion Board (HPB)",
+    "source_url": "https://www.healthhub.sg/live-healthy",
+    "numeric_claim": "30%",
+}
+
+
+class StubClient:
+    """Stands in for OpenRouterClient: canned generation/evaluation replies."""
+
+    insights = [INSIGHT]
+
+    def __init__(self, model=None, api_key=None, **kwargs):
+        self.default_model = model
+        self.rate_limiter = None
+        self.admission = None
+        self.requests = []  # (prompt, max_tokens) per call
+
+    def attach_admission(self, admission):
+        self.admission = admission
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def generate(
+        self, prompt, model=None, temperature=0.7, max_tokens=4000, response_format=None
+    ):
+        self.requests.append((prompt, max_tokens))
+        if max_tokens == 1:
+            # Prompt cache warm-up
+            return ""
+        if response_format:
+            return json.dumps({"insights": self.insights})
+        return json.dumps({"overall_score": 4.0})
+
+
+def _pipeline(monkeypatch):
+    monkeypatch.setattr(generate_insights, "OpenRouterClient", StubClient)
+    return generate_insights.DYKPipeline(openrouter_api_key="test-key")
+
+
+def test_run_async_one_cohort(tmp_path, monkeypatch):
+    pipeline = _pipeline(monkeypatch)
+
+    # Source URL checks answered locally instead of over the network
+    session = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200))
+    )
+    pipeline.validator = AsyncInsightValidator(session=session)
+
+    async def run():
+        try:
+            return await pipeline.run_async(
+                max_cohorts=1, insights_per_call=1, output_dir=str(tmp_path)
+            )
+        finally:
+            await session.aclose()
+
+    summary = asyncio.run(run())
+
+    num_templates = len(pipeline.config_loader.insight_templates)
+    stats = summary["statistics"]
+    assert stats["total_cohorts"] == 1
+    assert stats["total_insights_generated"] == num_templates
+    assert stats["validation_pass_rate"] == 100.0
+    # Identical insights for one cohort differ only by template: each is
+    # evaluated
+    assert stats["total_insights_evaluated"] == num_templates
+    assert stats["average_evaluation_score"] == 4.0
+
+    final = json.loads((tmp_path / "insights_final.json").read_text("utf-8"))
+    assert final["total_insights"] == num_templates
+    assert all(i["evaluation"]["result"]["overall_score"] == 4.0 for i in final["insights"])
+    assert (tmp_path / "insights_final.csv").exists()
+
+
+def test_prefiltered_insights_are_kept_unscored(tmp_path, monkeypatch):
+    placeholder = dict(INSIGHT, source_url="https://example.com/walking")
+    monkeypatch.setattr(StubClient, "insights", [INSIGHT, placeholder])
+    pipeline = _pipeline(monkeypatch)
+
+    summary = asyncio.run(
+        pipeline.run_async(
+            max_cohorts=1, skip_validation=True, output_dir=str(tmp_path)
+        )
+    )
+
+    num_templates = len(pipeline.config_loader.insight_templates)
+    stats = summary["statistics"]
+    assert stats["evaluations_prefiltered"] == num_templates
+    assert stats["total_insights_evaluated"] == num_templates
+    assert stats["average_evaluation_score"] == 4.0
+
+    final = json.loads((tmp_path / "insights_final.json").read_text("utf-8"))
+    assert final["total_insights"] == 2 * num_templates
+    skipped = [i for i in final["insights"] if "skipped" in i["evaluation"]]
+    assert len(skipped) == num_templates
+    for insight in skipped:
+        assert insight["source_url"] == placeholder["source_url"]
+        assert insight["evaluation"]["skipped"] == "pre-filter"
+        assert insight["evaluation"]["issues"] == [
+            "Placeholder host 'example.com': https://example.com/walking"
+        ]
+        assert insight["evaluation"]["evaluation_timestamp"]
+
+
+def test_validator_trusts_configured_sources(monkeypatch):
+    pipeline = _pipeline(monkeypatch)
+
+    assert pipeline.validator._is_trusted("www.healthhub.sg")
+    assert pipeline.validator._is_trusted("www.moh.gov.sg")
+    assert not pipeline.validator._is_trusted("example.org")
+
+
+def test_prompt_cache_is_warmed_before_generation(tmp_path, monkeypatch):
+    pipeline = _pipeline(monkeypatch)
+
+    asyncio.run(
+        pipeline.run_async(
+            max_cohorts=1,
+            skip_validation=True,
+            skip_evaluation=True,
+            output_dir=str(tmp_path),
+        )
+    )
+
+    (warm_up, warm_up_tokens), *generation = pipeline.gen_llm.requests
+    assert warm_up_tokens == 1
+    assert len(generation) == len(pipeline.config_loader.insight_templates)
+    # Every generation call reuses the warmed system block
+    assert all(prompt[0] == warm_up[0] for prompt, _ in generation)
+
+
+def test_csv_export_flattens_insights(tmp_path):
+    cohort = {"name": "seniors", "dimensions": {"age": "60+"}, "description": "Seniors"}
+    evaluated = dict(
+        INSIGHT,
+        metadata={
+            "cohort": cohort,
+            "insight_template": {"type": "risk_factor"},
+            "generation_model": "test/model",
+        },
+        evaluation={
+            "result": {
+                "overall_score": 4.5,
+                "safety": {"score": 5},
+                "source_faithfulness": {"score": 4},
+                "recommendation": "approve",
+            },
+            "evaluation_model": "test/judge",
+            "evaluation_timestamp": "2026-01-01T00:00:00",
+        },
+    )
+    prefiltered = dict(
+        evaluated, evaluation={"skipped": "pre-filter", "issues": ["bad URL"]}
+    )
+
+    pipeline = generate_insights.DYKPipeline.__new__(generate_insights.DYKPipeline)
+    csv_file = pipeline._export_to_csv([evaluated, prefiltered], str(tmp_path))
+
+    with open(csv_file, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    assert len(rows) == 2
+    row = rows[0]
+    assert row["full_insight"] == " ".join(
+        [INSIGHT["hook"], INSIGHT["explanation"], INSIGHT["action"]]
+    )
+    assert row["source_url"] == INSIGHT["source_url"]
+    assert row["cohort_params"] == str(cohort["dimensions"])
+    assert row["insight_template"] == "risk_factor"
+    assert row["eval_score"] == "4.5"
+    assert (row["safety"], row["faithfulness"], row["relevance"]) == ("5", "4", "")
+    assert row["recommendation"] == "approve"
+    assert row["eval_model"] == "test/judge"
+    # Unscored insights keep their content with blank score columns
+    assert rows[1]["hook"] == INSIGHT["hook"]
+    assert rows[1]["eval_score"] == ""
+
+
+def test_duplicate_insights_share_one_evaluation(tmp_path, monkeypatch):
+    monkeypatch.setattr(StubClient, "insights", [INSIGHT, INSIGHT])
+    pipeline = _pipeline(monkeypatch)
+
+    summary = asyncio.run(
+        pipeline.run_async(
+            max_cohorts=1, skip_validation=True, output_dir=str(tmp_path)
+        )
+    )
+
+    num_templates = len(pipeline.config_loader.insight_templates)
+    assert len(pipeline.eval_llm.requests) == num_templates
+    stats = summary["statistics"]
+    assert stats["duplicate_evaluations_skipped"] == num_templates
+    assert stats["total_insights_evaluated"] == 2 * num_templates
+
+    final = json.loads((tmp_path / "insights_final.json").read_text("utf-8"))
+    assert all(i["evaluation"]["result"]["overall_score"] == 4.0 for i in final["insights"])
@@ -0,0 +1,193 @@
+"""Tests for the insight generator."""
+
+import asyncio
+import json
+
+from src.core.insight_generator import InsightGenerator
+from src.prompts.prompt_templates import PromptTemplates
+from src.utils.config_loader import ConfigLoader
+
+INSIGHT = {"hook": "Did you know?", "numeric_claim": "30%"}
+
+
+class ReplyClient:
+    """Minimal OpenRouterClient stand-in that always returns one reply."""
+
+    default_model = "test/model"
+    rate_limiter = None
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.max_tokens = []
+        self.prompts = []
+
+    def attach_admission(self, admission):
+        pass
+
+    async def generate(
+        self, prompt, model=None, temperature=0.7, max_tokens=4000, response_format=None
+    ):
+        self.max_tokens.append(max_tokens)
+        self.prompts.append(prompt)
+        return self.reply
+
+
+def test_generate_multi_skips_malformed_entries():
+    config = ConfigLoader("singapore")
+    templates = list(config.insight_templates.values())[:2]
+    first, second = templates[0]["type"], templates[1]["type"]
+    reply = json.dumps(
+        {
+            "results": [
+                "not an entry",
+                None,
+                ["also", "not", "an", "entry"],
+                {"template_id": first, "insights": [INSIGHT]},
+                {"template_id": second, "insights": "not a list"},
+            ]
+        }
+    )
+    generator = InsightGenerator(ReplyClient(reply), PromptTemplates())
+
+    result = asyncio.run(
+        generator.generate_multi(
+            cohort=config.priority_cohorts[0],
+            insight_templates=templates,
+            health_domains=config.health_domains,
+            sources=config.source_names,
+            market="singapore",
+            num_insights=1,
+        )
+    )
+
+    assert result == {first: {"insights": [INSIGHT]}}
+
+
+def test_generate_multi_ignores_non_list_results():
+    config = ConfigLoader("singapore")
+    templates = list(config.insight_templates.values())[:2]
+    reply = json.dumps({"results": {"template_id": templates[0]["type"]}})
+    generator = InsightGenerator(ReplyClient(reply), PromptTemplates())
+
+    result = asyncio.run(
+        generator.generate_multi(
+            cohort=config.priority_cohorts[0],
+            insight_templates=templates,
+            health_domains=config.health_domains,
+            sources=config.source_names,
+            market="singapore",
+            num_insights=1,
+        )
+    )
+
+    assert result == {}
+
+
+def test_generate_multi_budget_scales_with_templates():
+    config = ConfigLoader("singapore")
+    templates = list(config.insight_templates.values())[:3]
+    client = ReplyClient(json.dumps({"results": []}))
+    generator = InsightGenerator(client, PromptTemplates())
+
+    async def run():
+        await generator.generate(
+            cohort=config.priority_cohorts[0],
+            insight_template=templates[0],
+            health_domains=config.health_domains,
+            sources=config.source_names,
+        )
+        await generator.generate_multi(
+            cohort=config.priority_cohorts[0],
+            insight_templates=templates,
+            health_domains=config.health_domains,
+            sources=config.source_names,
+        )
+
+    asyncio.run(run())
+
+    # Each template gets the budget of a single-template call
+    single, multi = client.max_tokens
+    assert multi == 3 * single
+
+
+def _generate_once(generator, config, temperature):
+    return asyncio.run(
+        generator.generate(
+            cohort=config.priority_cohorts[0],
+            insight_template=next(iter(config.insight_templates.values())),
+            health_domains=config.health_domains,
+            sources=config.source_names,
+            temperature=temperature,
+        )
+    )
+
+
+def test_response_cache_keys_on_response_format(tmp_path):
+    config = ConfigLoader("singapore")
+    client = ReplyClient(json.dumps({"insights": [INSIGHT]}))
+
+    structured = InsightGenerator(client, PromptTemplates(), cache_dir=tmp_path)
+    plain = InsightGenerator(
+        client, PromptTemplates(), cache_dir=tmp_path, structured_output=False
+    )
+
+    assert _generate_once(structured, config, 0.0) == {"insights": [INSIGHT]}
+    assert _generate_once(structured, config, 0.0) == {"insights": [INSIGHT]}
+    assert len(client.max_tokens) == 1  # Second call answered from disk
+
+    # Same prompt without the structured-output spec is a different request
+    _generate_once(plain, config, 0.0)
+    assert len(client.max_tokens) == 2
+
+
+def test_response_cache_skips_sampled_calls(tmp_path):
+    config = ConfigLoader("singapore")
+    client = ReplyClient(json.dumps({"insights": [INSIGHT]}))
+    generator = InsightGenerator(client, PromptTemplates(), cache_dir=tmp_path)
+
+    _generate_once(generator, config, 0.7)
+    _generate_once(generator, config, 0.7)
+    assert len(client.max_tokens) == 2
+
+
+def test_warm_up_sends_the_generation_system_block_once():
+    config = ConfigLoader("singapore")
+    client = ReplyClient(json.dumps({"insights": [INSIGHT]}))
+    generator = InsightGenerator(client, PromptTemplates())
+
+    async def run():
+        warmed = await generator.warm_prompt_cache(
+            config.health_domains, config.source_names
+        )
+        # Unchanged block: no second warm-up request
+        rewarmed = await generator.warm_prompt_cache(
+            config.health_domains, config.source_names
+        )
+        await generator.generate(
+            cohort=config.priority_cohorts[0],
+            insight_template=next(iter(config.insight_templates.values())),
+            health_domains=config.health_domains,
+            sources=config.source_names,
+        )
+        return warmed, rewarmed
+
+    assert asyncio.run(run()) == (True, False)
+    warm_up, generation = client.prompts
+    assert client.max_tokens[0] == 1
+    assert warm_up[0] == generation[0]
+
+
+def test_well_formed_items_are_salvaged_from_a_broken_response():
+    config = ConfigLoader("singapore")
+    second = dict(INSIGHT, hook="Did you know more?")
+    # Middle item is malformed and the array is never closed
+    reply = (
+        '{"insights": [' + json.dumps(INSIGHT) + ', {"hook": "Did you know" "x"}, '
+        + json.dumps(second) + ', {"hook": "cut off'
+    )
+    generator = InsightGenerator(ReplyClient(reply), PromptTemplates())
+
+    result = _generate_once(generator, config, 0.7)
+
+    assert result == {"insights": [INSIGHT, second]}
+    assert generator.partial_recoveries == 1
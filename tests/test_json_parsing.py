@@ -0,0 +1,38 @@
+"""Tests for LLM JSON parsing and repair."""
+
+import json
+
+import pytest
+
+from src.utils.json_parsing import parse_json_response
+
+
+def test_parses_fenced_response():
+    assert parse_json_response('```json\n{"a": 1}\n```') == {"a": 1}
+
+
+@pytest.mark.parametrize(
+    "response, expected",
+    [
+        # Missing comma after an object, bracket inside an earlier string
+        (
+            '{"hook": "Rates rose [WHO]", "x": {"a":1}"y": 2}',
+            {"hook": "Rates rose [WHO]", "x": {"a": 1}, "y": 2},
+        ),
+        # Missing comma across lines, brace inside the following string
+        ('{"hook": "a"\n"b": "c}"\n}', {"hook": "a", "b": "c}"}),
+        # Trailing comma, with a comma-brace sequence inside a string
+        ('{"b": {"c": "x, }"},\n}', {"b": {"c": "x, }"}}),
+        # Several issues in one response
+        ('{"a": "[x]" "b": ["q"]"c": 1,}', {"a": "[x]", "b": ["q"], "c": 1}),
+        # Missing closing braces
+        ('{"a": {"b": [1, 2]', {"a": {"b": [1, 2]}}),
+    ],
+)
+def test_repairs_leave_string_values_untouched(response, expected):
+    assert parse_json_response(response) == expected
+
+
+def test_truncated_response_fails_fast():
+    with pytest.raises(json.JSONDecodeError, match="truncated"):
+        parse_json_response('{"insights": [{"hook": "Did you kn')
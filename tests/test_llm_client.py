@@ -0,0 +1,162 @@
+"""Tests for the OpenRouter client."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.core.llm_client import (
+    AdmissionController,
+    FatalAPIError,
+    OpenRouterClient,
+    RateLimiter,
+)
+
+
+def _concurrent_pair(temperature):
+    """Two concurrent identical generate() calls; returns the request count."""
+    client = OpenRouterClient(model="test/model", api_key="test-key")
+    requests = []
+
+    async def fake_generate(prompt, model, temperature, max_tokens, response_format):
+        requests.append(prompt)
+        await asyncio.sleep(0.01)
+        return f"reply {len(requests)}"
+
+    client._generate = fake_generate
+
+    async def run():
+        return await asyncio.gather(
+            client.generate("prompt", temperature=temperature),
+            client.generate("prompt", temperature=temperature),
+        )
+
+    asyncio.run(run())
+    return len(requests), client.coalesced_requests
+
+
+def test_coalesces_deterministic_calls():
+    assert _concurrent_pair(0.0) == (1, 1)
+
+
+def test_sampled_calls_are_not_coalesced():
+    assert _concurrent_pair(0.7) == (2, 0)
+
+
+def test_admission_limit_adapts_to_throttling():
+    async def run():
+        admission = AdmissionController(8, max_limit=9, increase_after=2)
+        await admission.on_throttle()
+        halved = admission.limit
+        for _ in range(2):
+            await admission.on_success()
+        grown = admission.limit
+        for _ in range(10):
+            await admission.on_success()
+        return halved, grown, admission.limit
+
+    # Halve on a 429, then +1 per increase_after successes, up to max_limit
+    assert asyncio.run(run()) == (4, 5, 9)
+
+
+def test_admission_limit_bounds_concurrency():
+    active = peak = 0
+
+    async def task(admission):
+        nonlocal active, peak
+        async with admission:
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    async def run():
+        admission = AdmissionController(3)
+        await asyncio.gather(*(task(admission) for _ in range(10)))
+
+    asyncio.run(run())
+    assert peak == 3
+
+
+def test_rate_limiter_allows_a_burst_then_paces():
+    limiter = RateLimiter(requests_per_minute=600, requests_per_second=5)
+
+    async def run():
+        start = time.monotonic()
+        for _ in range(5):
+            await limiter.acquire()
+        burst = time.monotonic() - start
+        await limiter.acquire()
+        return burst, time.monotonic() - start
+
+    burst, paced = asyncio.run(run())
+    assert burst < 0.05
+    # The sixth request waits for one token (1/5 s)
+    assert 0.15 < paced < 0.5
+
+
+def _client_answering(responses):
+    """Client whose session returns responses in turn; records the count."""
+    sent = []
+
+    def handler(request):
+        response = responses[len(sent)]
+        sent.append(request)
+        return response
+
+    client = OpenRouterClient(model="test/model", api_key="test-key")
+    client._session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client, sent
+
+
+COMPLETION = {"choices": [{"message": {"content": "reply"}}]}
+
+
+def test_rate_limited_requests_honour_retry_after():
+    client, sent = _client_answering(
+        [
+            httpx.Response(429, headers={"Retry-After": "0"}),
+            httpx.Response(200, json=COMPLETION),
+        ]
+    )
+    admission = AdmissionController(8)
+    client.attach_admission(admission)
+
+    async def run():
+        try:
+            return await client.generate("prompt", temperature=0.7)
+        finally:
+            await client._session.aclose()
+
+    start = time.monotonic()
+    assert asyncio.run(run()) == "reply"
+    assert time.monotonic() - start < 1.5  # Retry-After 0 plus jitter
+    assert len(sent) == 2
+    assert admission.limit == 4
+
+
+def test_fatal_client_errors_are_not_retried():
+    client, sent = _client_answering([httpx.Response(401)])
+
+    async def run():
+        try:
+            return await client.generate("prompt", temperature=0.7)
+        finally:
+            await client._session.aclose()
+
+    with pytest.raises(FatalAPIError):
+        asyncio.run(run())
+    assert len(sent) == 1
+
+
+def test_retry_wait_is_capped():
+    response = httpx.Response(
+        503,
+        headers={"Retry-After": "3600"},
+        request=httpx.Request("POST", "https://openrouter.ai"),
+    )
+    error = httpx.HTTPStatusError("unavailable", request=response.request, response=response)
+
+    assert 60.0 <= OpenRouterClient._retry_wait(0, error) <= 61.0
+    assert 0.0 <= OpenRouterClient._retry_wait(10, ValueError()) <= 60.0
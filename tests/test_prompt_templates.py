@@ -0,0 +1,86 @@
+"""Tests for prompt rendering."""
+
+from src.prompts.prompt_templates import PromptTemplates
+from src.utils.config_loader import ConfigLoader
+
+CONFIG = ConfigLoader("singapore")
+COHORTS = CONFIG.priority_cohorts
+TEMPLATES = list(CONFIG.insight_templates.values())
+
+
+def _messages(templates, cohort, template):
+    return templates.generation_messages(
+        cohort=cohort,
+        insight_template=template,
+        health_domains=CONFIG.health_domains,
+        sources=CONFIG.source_names,
+        num_insights=5,
+    )
+
+
+def test_generation_prefix_is_shared_by_every_call():
+    templates = PromptTemplates()
+    calls = [
+        _messages(templates, COHORTS[0], TEMPLATES[0]),
+        _messages(templates, COHORTS[1], TEMPLATES[0]),
+        _messages(templates, COHORTS[0], TEMPLATES[1]),
+    ]
+
+    prefixes = {m[0]["content"][0]["text"] for m in calls}
+    assert len(prefixes) == 1
+    assert all(m[0]["content"][0]["cache_control"] for m in calls)
+
+    # The per-call parts live in the user message only
+    suffixes = [m[1]["content"] for m in calls]
+    assert len(set(suffixes)) == 3
+    assert COHORTS[1]["description"] in suffixes[1]
+    assert TEMPLATES[1]["description"] in suffixes[2]
+
+
+def test_generation_prompt_is_prefix_then_suffix():
+    templates = PromptTemplates()
+    messages = _messages(templates, COHORTS[0], TEMPLATES[0])
+    prompt = templates.generation_prompt(
+        cohort=COHORTS[0],
+        insight_template=TEMPLATES[0],
+        health_domains=CONFIG.health_domains,
+        sources=CONFIG.source_names,
+        num_insights=5,
+    )
+
+    assert prompt == messages[0]["content"][0]["text"] + "\n\n" + messages[1]["content"]
+
+
+def test_prefix_does_not_depend_on_config_identity():
+    # Equal configs loaded separately render a byte-identical prefix
+    first = PromptTemplates().prepare_static(
+        CONFIG.health_domains, CONFIG.source_names
+    )
+    reloaded = ConfigLoader("singapore")
+    second = PromptTemplates().prepare_static(
+        reloaded.health_domains, reloaded.source_names
+    )
+
+    assert first == second
+
+
+def test_compiled_prompt_matches_direct_rendering():
+    templates = PromptTemplates()
+    compiled = templates.compile(
+        TEMPLATES[0], CONFIG.health_domains, CONFIG.source_names, num_insights=5
+    )
+
+    for cohort in COHORTS[:3]:
+        assert compiled.messages(cohort) == _messages(
+            PromptTemplates(), cohort, TEMPLATES[0]
+        )
+
+
+def test_compiled_suffix_is_reused_across_cohorts():
+    templates = PromptTemplates()
+    args = (TEMPLATES[0], CONFIG.health_domains, CONFIG.source_names, "singapore", 5)
+
+    assert templates._compiled_for(*args) is templates._compiled_for(*args)
+    # A different insight count is a different suffix
+    other = templates._compiled_for(*args[:4], 3)
+    assert other is not templates._compiled_for(*args)
@@ -0,0 +1,37 @@
+"""Tests for the on-disk LLM response cache."""
+
+from src.utils.response_cache import ResponseCache
+
+MESSAGES = [{"role": "user", "content": "prompt"}]
+
+
+def test_round_trip_and_statistics(tmp_path):
+    cache = ResponseCache(tmp_path)
+    key = ResponseCache.make_key(MESSAGES, "test/model", 0.0, 100)
+
+    assert cache.get(key) is None
+    cache.put(key, {"insights": [{"hook": "Did you know?"}]})
+    assert cache.get(key) == {"insights": [{"hook": "Did you know?"}]}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Entries persist across instances (and processes)
+    assert ResponseCache(tmp_path).get(key) == {"insights": [{"hook": "Did you know?"}]}
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = ResponseCache(tmp_path)
+    key = ResponseCache.make_key("prompt", "test/model", 0.0, 100)
+    cache.put(key, {"a": 1})
+    cache._path(key).write_text("{not json", encoding="utf-8")
+
+    assert cache.get(key) is None
+
+
+def test_keys_cover_every_request_parameter():
+    base = ResponseCache.make_key(MESSAGES, "test/model", 0.0, 100)
+
+    assert ResponseCache.make_key(list(MESSAGES), "test/model", 0.0, 100) == base
+    assert ResponseCache.make_key(MESSAGES, "other/model", 0.0, 100) != base
+    assert ResponseCache.make_key(MESSAGES, "test/model", 0.7, 100) != base
+    assert ResponseCache.make_key(MESSAGES, "test/model", 0.0, 200) != base
+    assert ResponseCache.make_key("prompt", "test/model", 0.0, 100) != base
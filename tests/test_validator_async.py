@@ -0,0 +1,265 @@
+"""Tests for the async insight validator."""
+
+import asyncio
+import time
+
+import httpx
+
+from src.core.llm_client import RateLimiter
+from src.core.validator_async import AsyncInsightValidator
+
+
+def _validator(handler, **kwargs):
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncInsightValidator(session=session, **kwargs), session
+
+
+def test_rate_limited_host_does_not_block_other_hosts():
+    validator, session = _validator(lambda request: httpx.Response(200), max_concurrent=1)
+    # Two requests per second to slow.example; the other host is unlimited
+    validator._host_limiters["slow.example"] = RateLimiter(
+        requests_per_minute=120, requests_per_second=2
+    )
+    validator.per_host_rate = 1000
+
+    async def run():
+        start = time.monotonic()
+        done = {}
+
+        async def probe(url):
+            issues = await validator._probe_url(url)
+            done[url] = time.monotonic() - start
+            return issues
+
+        try:
+            results = await asyncio.gather(
+                *(probe(f"https://slow.example/{i}") for i in range(4)),
+                probe("https://fast.example/page"),
+            )
+        finally:
+            await session.aclose()
+        return results, done
+
+    results, done = asyncio.run(run())
+
+    assert all(issues == [] for issues in results)
+    # Slow-host URLs wait for tokens without holding the only admission slot
+    assert done["https://fast.example/page"] < 0.3
+    assert done["https://slow.example/3"] >= 0.5
+
+
+def test_ranged_get_fallback_confirms_head_rejection():
+    def handler(request):
+        if request.method == "HEAD":
+            return httpx.Response(405)
+        return httpx.Response(206)
+
+    validator, session = _validator(handler, max_concurrent=1)
+
+    async def run():
+        try:
+            return await validator._probe_url("https://example.org/page")
+        finally:
+            await session.aclose()
+
+    assert asyncio.run(run()) == []
+    # Both requests returned their slot
+    assert validator.admission._active == 0
+
+
+def test_quick_check_and_validation_agree_on_url_format():
+    validator, session = _validator(lambda request: httpx.Response(200))
+    insight = {"source_name": "HPB", "source_url": "ftp://files.hpb.gov.sg/report"}
+
+    async def run():
+        try:
+            return await validator._validate_source(insight)
+        finally:
+            await session.aclose()
+
+    source_check = asyncio.run(run())
+    expected = "Unsupported URL scheme 'ftp': ftp://files.hpb.gov.sg/report"
+    assert source_check["issues"] == [expected]
+    assert expected in validator.quick_check(insight)
+
+
+def test_trusted_host_is_probed_once():
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        return httpx.Response(200)
+
+    validator, session = _validator(handler, trusted_domains=["healthhub.sg"])
+    urls = [
+        "https://www.healthhub.sg/a",
+        "https://www.healthhub.sg/b",
+        "https://other.example/a",
+        "https://other.example/b",
+    ]
+
+    async def run():
+        try:
+            return [
+                await validator._validate_source({"source_name": "HPB", "source_url": u})
+                for u in urls
+            ]
+        finally:
+            await session.aclose()
+
+    results = asyncio.run(run())
+
+    assert all(result["passed"] for result in results)
+    # The second healthhub.sg URL is accepted without a request
+    assert requested == [urls[0], urls[2], urls[3]]
+
+
+def _recording_validator(statuses, **kwargs):
+    """Validator whose session answers with statuses in turn (last repeats)."""
+    requested = []
+
+    def handler(request):
+        status = statuses[min(len(requested), len(statuses) - 1)]
+        requested.append(request.method)
+        if isinstance(status, Exception):
+            raise status
+        return httpx.Response(status, headers={"Retry-After": "0"})
+
+    validator, session = _validator(handler, **kwargs)
+    return validator, session, requested
+
+
+def _validate_sources(validator, session, urls, use_cache=True):
+    async def run():
+        try:
+            return [
+                await validator._validate_source(
+                    {"source_name": "HPB", "source_url": url}, use_cache
+                )
+                for url in urls
+            ]
+        finally:
+            await session.aclose()
+
+    return asyncio.run(run())
+
+
+def test_bogus_source_urls_are_rejected_without_a_request():
+    validator, session, requested = _recording_validator([200])
+    urls = [
+        "https://www.example.com/page",
+        "http://localhost:8000/page",
+        "https://192.168.0.1/page",
+        "mailto:hpb@healthhub.sg",
+        "https://intranet/page",
+        "not a url",
+    ]
+
+    results = _validate_sources(validator, session, urls)
+
+    assert [r["issues"] for r in results] == [
+        ["Placeholder host 'example.com': https://www.example.com/page"],
+        ["Placeholder host 'localhost': http://localhost:8000/page"],
+        ["IP address instead of a domain '192.168.0.1': https://192.168.0.1/page"],
+        ["Invalid URL format: mailto:hpb@healthhub.sg"],
+        ["Invalid host 'intranet': https://intranet/page"],
+        ["Invalid URL format: not a url"],
+    ]
+    assert requested == []
+
+
+def test_transient_failures_are_retried_once():
+    validator, session, requested = _recording_validator([503, 200])
+    assert _validate_sources(validator, session, ["https://www.moh.gov.sg/a"])[0][
+        "passed"
+    ]
+    assert requested == ["HEAD", "HEAD"]
+
+
+def test_connection_errors_are_retried_once():
+    error = httpx.ConnectError("connection refused")
+    validator, session, requested = _recording_validator([error, 200])
+    assert _validate_sources(validator, session, ["https://www.moh.gov.sg/a"])[0][
+        "passed"
+    ]
+    assert len(requested) == 2
+
+
+def test_persistent_failures_are_reported():
+    validator, session, requested = _recording_validator([503])
+    result = _validate_sources(validator, session, ["https://www.moh.gov.sg/a"])[0]
+
+    assert result["issues"] == ["Source URL not accessible, status code: 503"]
+    assert requested == ["HEAD", "HEAD"]
+
+
+def test_missing_pages_are_not_retried():
+    validator, session, requested = _recording_validator([404])
+    result = _validate_sources(validator, session, ["https://www.moh.gov.sg/a"])[0]
+
+    assert result["issues"] == ["Source URL not accessible, status code: 404"]
+    assert requested == ["HEAD"]
+
+
+def test_url_checks_are_shared():
+    validator, session, requested = _recording_validator([200])
+    url = "https://www.moh.gov.sg/a"
+
+    async def run():
+        try:
+            await asyncio.gather(validator._check_url(url), validator._check_url(url))
+            # Scheme and host case do not make a different URL
+            await validator._check_url("HTTPS://WWW.MOH.GOV.SG/a")
+        finally:
+            await session.aclose()
+
+    asyncio.run(run())
+    assert len(requested) == 1
+
+
+def test_url_checks_can_be_forced():
+    validator, session, requested = _recording_validator([200])
+    url = "https://www.moh.gov.sg/a"
+    _validate_sources(validator, session, [url, url], use_cache=True)
+    assert len(requested) == 1
+
+    validator, session, requested = _recording_validator([200])
+    _validate_sources(validator, session, [url, url], use_cache=False)
+    assert len(requested) == 2
+
+
+def test_expired_url_checks_are_repeated():
+    validator, session, requested = _recording_validator([200], url_cache_ttl=0)
+    _validate_sources(validator, session, ["https://www.moh.gov.sg/a"] * 2)
+
+    assert len(requested) == 2
+
+
+def test_batch_reports_malformed_insights_as_results():
+    validator, session, requested = _recording_validator([200])
+    good = {
+        "hook": "Did you know a daily walk cuts heart disease risk by 30%?",
+        "explanation": " ".join(["Regular brisk walking strengthens the heart."] * 7),
+        "action": "Walk briskly for 30 minutes after dinner each day.",
+        "source_name": "Health Promotion Board (HPB)",
+        "source_url": "https://www.healthhub.sg/live-healthy",
+        "numeric_claim": "30%",
+    }
+    missing_fields = {"hook": "Did you know?", "source_url": good["source_url"]}
+
+    async def run():
+        try:
+            return await validator.validate_batch([good, "not an insight", missing_fields])
+        finally:
+            await session.aclose()
+
+    results = asyncio.run(run())
+
+    assert [r["validated"] for r in results] == [True, False, False]
+    schema_issues = results[1]["checks"]["schema_conformity"]["issues"]
+    assert schema_issues == ["Insight must be a JSON object, got str."]
+    # Insights failing local checks never reach the network
+    assert results[2]["checks"]["source_verification"]["issues"] == [
+        "Skipped: JSON or schema check failed"
+    ]
+    assert requested == ["HEAD"]